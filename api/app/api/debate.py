@@ -1,5 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
+import json
 from sqlalchemy.orm import Session
 from app.models.schemas import (
     DebateStartRequest,
@@ -14,11 +17,17 @@ from app.models.schemas import (
 from app.services.debate_service import DebateService
 from app.services.agent_service import AgentService
 from app.utils.response_parser import ResponseParser
-from app.core.database import get_db
+from app.utils.debate_events import debate_event_bus
+from app.core.database import get_db, SessionLocal
 from app.core.config import settings
 
 router = APIRouter()
 
+# SSE 事件流：無變更時的心跳間隔（秒）
+EVENT_STREAM_HEARTBEAT_SECONDS = 15
+# 辯論進入這些狀態後不再變化，事件流隨即結束
+_TERMINAL_DEBATE_STATUSES = {"completed", "failed", "expired"}
+
 @router.post("/start", response_model=DebateStartResponse, summary="啟動多Agent辯論")
 def start_debate(
     request: DebateStartRequest,
@@ -244,8 +253,99 @@ def get_debate_history(
     debate = debate_service.get_debate(session_id)
     debate_messages = debate_service.get_debate_messages(session_id)
     
-    parser = ResponseParser()
-    formatted_history = parser.format_conversation_history_for_display(
+    formatted_history = _format_debate_messages(debate_messages)
+    
+    return {
+        "session_id": session_id,
+        "topic": debate.topic,
+        "total_rounds": debate.rounds,
+        "history": formatted_history,
+        "status": debate.status,
+        "started_at": debate.created_at,
+        "updated_at": debate.updated_at
+    }
+
+@router.get("/{session_id}/events", summary="訂閱辯論事件流 (SSE)")
+def stream_debate_events(
+    session_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    以 Server-Sent Events 推送辯論狀態變化，取代客戶端輪詢 status/history
+    
+    - **session_id**: 辯論會話的唯一標識
+    
+    僅在狀態、進度、輪次或訊息數變化時推送一次 `status` 事件，
+    其中 `history` 只包含上次推送之後的新訊息；辯論結束後關閉連線。
+    """
+    # 先驗證會話存在，無效ID直接返回400/404而不是空的事件流
+    DebateService(db).get_debate(session_id)
+    
+    return StreamingResponse(
+        _debate_event_stream(session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _read_debate_snapshot(session_id: str):
+    """讀取辯論狀態與訊息；串流期間請求的資料庫會話已關閉，每次讀取使用獨立的會話"""
+    db = SessionLocal()
+    try:
+        debate_service = DebateService(db)
+        return (
+            debate_service.get_debate_status(session_id),
+            debate_service.get_debate_messages(session_id)
+        )
+    finally:
+        db.close()
+
+async def _debate_event_stream(session_id: str):
+    """產生 SSE 事件；在兩次變更之間等待事件匯流排，而非定時查詢資料庫
+
+    等待時不佔用執行緒池，只有讀取資料庫快照時才短暫交給執行緒池執行。
+    """
+    version = debate_event_bus.version(session_id)
+    last_snapshot = None
+    sent_messages = 0
+    
+    while True:
+        debate_status, debate_messages = await run_in_threadpool(
+            _read_debate_snapshot, session_id
+        )
+        
+        snapshot = (
+            debate_status.status,
+            debate_status.progress,
+            debate_status.current_round,
+            len(debate_messages)
+        )
+        if snapshot != last_snapshot:
+            payload = {
+                "session_id": session_id,
+                "status": debate_status.status,
+                "progress": debate_status.progress,
+                "current_round": debate_status.current_round,
+                "total_rounds": debate_status.total_rounds,
+                "message_count": len(debate_messages),
+                "history": _format_debate_messages(debate_messages[sent_messages:])
+            }
+            yield f"event: status\ndata: {json.dumps(payload, ensure_ascii=False, default=str)}\n\n"
+            last_snapshot = snapshot
+            sent_messages = len(debate_messages)
+        else:
+            # 逾時喚醒但無變化：送出註解行作為心跳，保持代理與客戶端連線
+            yield ": keep-alive\n\n"
+        
+        if debate_status.status in _TERMINAL_DEBATE_STATUSES:
+            return
+        
+        version = await debate_event_bus.wait_for_change(
+            session_id, version, EVENT_STREAM_HEARTBEAT_SECONDS
+        )
+
+def _format_debate_messages(debate_messages) -> List[dict]:
+    """將辯論訊息轉換為歷史記錄的顯示格式"""
+    return ResponseParser.format_conversation_history_for_display(
         [
             {
                 "agent": message.agent_id,
@@ -257,16 +357,6 @@ def get_debate_history(
             for message in debate_messages
         ]
     )
-    
-    return {
-        "session_id": session_id,
-        "topic": debate.topic,
-        "total_rounds": debate.rounds,
-        "history": formatted_history,
-        "status": debate.status,
-        "started_at": debate.created_at,
-        "updated_at": debate.updated_at
-    }
 
 @router.post("/{session_id}/cancel", summary="取消辯論")
 def cancel_debate(
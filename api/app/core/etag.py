@@ -0,0 +1,65 @@
+import hashlib
+import re
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+# 客戶端會輪詢的端點：辯論的 status/history/result 與 Agent 列表/詳情
+# 其餘 GET 回應不緩衝也不計算雜湊
+POLLED_PATH_PATTERN = re.compile(r"/(debate/[^/]+/(status|history|result)|agents(/[^/]+)?)/?$")
+
+
+def _strip_weak(tag: str) -> str:
+    """去掉弱驗證器前綴 W/，用於弱比較"""
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """依 If-None-Match 的逗號分隔清單或 `*` 以弱比較判斷 ETag 是否相符"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    current = _strip_weak(etag)
+    return any(_strip_weak(tag) == current for tag in candidates)
+
+
+class ETagMiddleware(BaseHTTPMiddleware):
+    """為輪詢端點的 GET JSON 回應加上 ETag，並以 304 回應未變化的條件請求
+
+    輪詢 status/history/result 與 Agent 等端點時，客戶端帶上 If-None-Match，
+    內容未變化就不必重新傳輸與解析整份 JSON。
+    其他路徑與串流回應（例如 SSE 事件流）原樣放行，不緩衝回應內容。
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+
+        if (
+            request.method != "GET"
+            or response.status_code != 200
+            or not POLLED_PATH_PATTERN.search(request.url.path)
+            or not response.headers.get("content-type", "").startswith("application/json")
+        ):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+
+        # 以原始標頭清單複製，保留重複的標頭（例如多個 Set-Cookie）
+        headers = MutableHeaders(raw=list(response.raw_headers))
+        headers["ETag"] = etag
+        if _etag_matches(etag, request.headers.get("if-none-match")):
+            del headers["content-length"]
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers=headers,
+            media_type=response.media_type
+        )
@@ -5,6 +5,7 @@ import uvicorn
 from app.core.config import settings
 from app.api import router as api_router
 from app.core.database import engine, Base, SessionLocal
+from app.core.etag import ETagMiddleware
 from app.services.agent_service import AgentService
 from app.core.config import settings
 import logging
@@ -48,6 +49,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 為輪詢端點的GET JSON回應加上ETag，支援條件請求（304）
+app.add_middleware(ETagMiddleware)
+
 # 注册API路由
 app.include_router(api_router, prefix=settings.API_PREFIX)
 
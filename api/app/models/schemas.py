@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 import uuid
@@ -84,6 +84,9 @@ class DebateStatusResponse(BaseModel):
     estimated_completion_time: Optional[datetime] = None
 
 class N8NOptimizedResponse(BaseModel):
+    # 響應構建後即不再修改；凍結以防誤改共享實例
+    model_config = ConfigDict(frozen=True)
+
     session_id: str
     status: str  # "running", "completed", "failed"
     progress: float  # 0.0 - 1.0
@@ -28,6 +28,7 @@ from app.services.agent_service import AgentService
 from app.core.config import settings
 from app.core.redis import redis_client
 from app.utils.debate_manager import DebateManager
+from app.utils.debate_events import debate_event_bus
 
 class DebateService:
     def __init__(self, db: Session):
@@ -394,6 +395,7 @@ class DebateService:
             debate.status = "running"
             debate.updated_at = datetime.utcnow()
             self.db.commit()
+            debate_event_bus.publish(session_id)
             
             # 2. 获取参与辩论的Agent
             # 確保傳遞的是字串列表
@@ -445,12 +447,14 @@ class DebateService:
             debate.updated_at = datetime.utcnow()
             
             self.db.commit()
+            debate_event_bus.publish(session_id)
             
         except Exception as e:
             # 处理辩论过程中的错误
             debate.status = "failed"
             debate.updated_at = datetime.utcnow()
             self.db.commit()
+            debate_event_bus.publish(session_id)
             
             # 記錄錯誤日誌
             # 實際實現時應該使用logger
@@ -478,6 +482,7 @@ class DebateService:
             self.db.add(message)
             self.db.commit()
             self.db.refresh(message)
+            debate_event_bus.publish(debate_id)
             
             return message
         except Exception as e:
@@ -502,6 +507,7 @@ class DebateService:
         debate.progress = min(max(progress, 0.0), 100.0)
         debate.updated_at = datetime.utcnow()
         self.db.commit()
+        debate_event_bus.publish(session_id)
         
     def update_debate_status(self, session_id: str, status: DebateStatus):
         """更新辩论状态"""
@@ -509,6 +515,7 @@ class DebateService:
         debate.status = status.value
         debate.updated_at = datetime.utcnow()
         self.db.commit()
+        debate_event_bus.publish(session_id)
         
     def cancel_debate(self, session_id: str) -> Debate:
         """取消正在进行的辩论"""
@@ -526,5 +533,6 @@ class DebateService:
         debate.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(debate)
+        debate_event_bus.publish(session_id)
         
         return debate
\ No newline at end of file
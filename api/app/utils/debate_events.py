@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from typing import Dict, Set, Tuple
+
+
+class DebateEventBus:
+    """辯論變更通知：每個會話維護一個版本號，狀態或歷史變動時遞增
+
+    辯論在背景執行緒中以獨立的事件迴圈執行（見 DebateService.start_debate），
+    訂閱者則在伺服器的事件迴圈中等待。publish 透過 call_soon_threadsafe
+    喚醒各訂閱者所在迴圈上的 asyncio.Event，等待期間不佔用任何執行緒。
+
+    版本號與等待者都保存在目前的行程內：只有同一個 worker 行程中的 publish
+    才會喚醒訂閱者。以多個 worker 部署時，其他行程的更新只能在心跳逾時後
+    重新讀取資料庫時被看到。
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._waiters: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, session_id: str) -> None:
+        """標記會話已變更並喚醒所有等待者"""
+        session_id = str(session_id)
+        with self._lock:
+            self._versions[session_id] = self._versions.get(session_id, 0) + 1
+            waiters = list(self._waiters.get(session_id, ()))
+
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # 訂閱者的事件迴圈已關閉，無需喚醒
+                pass
+
+    def version(self, session_id: str) -> int:
+        """取得會話目前的版本號"""
+        with self._lock:
+            return self._versions.get(str(session_id), 0)
+
+    async def wait_for_change(self, session_id: str, last_version: int, timeout: float) -> int:
+        """等待直到會話版本號不同於 last_version 或逾時，返回最新版本號"""
+        session_id = str(session_id)
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+
+        with self._lock:
+            current = self._versions.get(session_id, 0)
+            if current != last_version:
+                return current
+            self._waiters.setdefault(session_id, set()).add(waiter)
+
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                session_waiters = self._waiters.get(session_id)
+                if session_waiters is not None:
+                    session_waiters.discard(waiter)
+                    if not session_waiters:
+                        del self._waiters[session_id]
+
+        return self.version(session_id)
+
+
+# 全域事件匯流排實例
+debate_event_bus = DebateEventBus()
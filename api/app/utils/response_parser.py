@@ -1,7 +1,22 @@
+import re
+from collections import deque
+from itertools import groupby, islice
 from typing import Dict, Any, List, Optional
 from app.models.schemas import N8NOptimizedResponse
 from datetime import datetime
 
+# 敏感键的子串模式，编译为单个正则，每个键只需扫描一次
+_SENSITIVE_PATTERNS = ("api_key", "token", "password", "secret", "auth")
+_SENSITIVE_RE = re.compile("|".join(map(re.escape, _SENSITIVE_PATTERNS)))
+# 常见的敏感键全名，命中时一次哈希查找即可返回，无需再跑正则
+_SENSITIVE_EXACT_KEYS = frozenset({
+    "api_key", "token", "password", "auth_token",
+    "password_hash", "secret_key", "client_secret",
+})
+
+# validate_response_format 支持的格式及其对应类型
+_RESPONSE_FORMAT_TYPES = {"json": dict, "list": list, "string": str}
+
 class ResponseParser:
     @staticmethod
     def parse_debate_result_to_n8n_format(
@@ -53,17 +68,19 @@ class ResponseParser:
     @staticmethod
     def extract_key_arguments_by_role(conversation_history: List[Dict[str, Any]]) -> Dict[str, List[str]]:
         """从对话历史中提取按角色分类的关键论点"""
-        key_arguments = {}
-        
+        key_arguments: Dict[str, List[str]] = {}
+
         for message in conversation_history:
             role = message.get("role", "unknown")
-            if role not in key_arguments:
-                key_arguments[role] = []
-            
+            # 每条消息只做一次字典查找，新角色才创建列表
+            bucket = key_arguments.get(role)
+            if bucket is None:
+                bucket = key_arguments[role] = []
+
             # 提取关键论点（这里简单地使用消息内容作为论点）
             # 实际实现中可以使用更复杂的提取算法
-            key_arguments[role].append(message.get("response", ""))
-        
+            bucket.append(message.get("response", ""))
+
         return key_arguments
     
     @staticmethod
@@ -72,29 +89,20 @@ class ResponseParser:
         """从对话历史中提取初步洞察"""
         # 这里提供一个简单的实现
         # 实际应用中可能需要使用LLM来提取洞察
-        insights = []
-        
         # 示例逻辑：提取每个轮次的主要观点
-        rounds = {}
-        for message in conversation_history:
-            round_num = message.get("round", 0)
-            if round_num not in rounds:
-                rounds[round_num] = []
-            rounds[round_num].append(message)
-        
-        # 为每个轮次生成一个洞察
-        for round_num in sorted(rounds.keys()):
-            if len(insights) >= max_insights:
-                break
-            
-            round_messages = rounds[round_num]
-            agents_in_round = [msg.get("agent", "Unknown") for msg in round_messages]
-            # 将UUID对象转换为字符串类型
-            agents_in_round_str = [str(agent_id) for agent_id in agents_in_round]
-            insight = f"第{round_num}轮参与讨论的Agent: {', '.join(agents_in_round_str)}"
-            insights.append(insight)
-        
-        return insights
+        # 稳定排序后按轮次分组，同一轮内保持原有发言顺序
+        def round_of(message: Dict[str, Any]) -> Any:
+            return message.get("round", 0)
+
+        rounds = groupby(sorted(conversation_history, key=round_of), key=round_of)
+
+        # 为每个轮次生成一个洞察，最多 max_insights 个
+        # 将UUID对象转换为字符串类型
+        return [
+            f"第{round_num}轮参与讨论的Agent: "
+            f"{', '.join(str(msg.get('agent', 'Unknown')) for msg in round_messages)}"
+            for round_num, round_messages in islice(rounds, max(max_insights, 0))
+        ]
     
     @staticmethod
     def format_conversation_history_for_display(conversation_history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -102,12 +110,16 @@ class ResponseParser:
         formatted_history = []
         
         for message in conversation_history:
+            # 仅在消息缺少时间戳时才取当前时间，避免每条消息都调用utcnow()
+            timestamp = message.get("timestamp")
+            if timestamp is None:
+                timestamp = datetime.utcnow()
             formatted_message = {
                 "agent_name": message.get("agent", "Unknown"),
                 "agent_role": message.get("role", "Unknown"),
                 "round": message.get("round", 0),
                 "content": message.get("response", ""),
-                "timestamp": message.get("timestamp", datetime.utcnow()).isoformat()
+                "timestamp": timestamp.isoformat()
             }
             formatted_history.append(formatted_message)
         
@@ -116,30 +128,50 @@ class ResponseParser:
     @staticmethod
     def validate_response_format(response: Any, expected_format: str = "json") -> bool:
         """验证响应格式是否符合预期"""
-        if expected_format.lower() == "json":
-            return isinstance(response, dict)
-        elif expected_format.lower() == "list":
-            return isinstance(response, list)
-        elif expected_format.lower() == "string":
-            return isinstance(response, str)
-        else:
-            return False
+        expected_type = _RESPONSE_FORMAT_TYPES.get(expected_format.lower())
+        return expected_type is not None and isinstance(response, expected_type)
     
     @staticmethod
     def sanitize_response_data(data: Any) -> Any:
         """清理响应数据，移除敏感信息"""
-        # 递归清理数据
-        if isinstance(data, dict):
-            return {key: ResponseParser.sanitize_response_data(value) 
-                   for key, value in data.items() 
-                   if not ResponseParser._is_sensitive_key(key)}
-        elif isinstance(data, list):
-            return [ResponseParser.sanitize_response_data(item) for item in data]
-        else:
+        if not isinstance(data, (dict, list)):
             return data
+
+        # 用工作队列迭代遍历嵌套结构，避免递归调用开销；
+        # 先占位子容器，保证输出保持输入的键顺序
+        is_sensitive_key = ResponseParser._is_sensitive_key
+        result = {} if isinstance(data, dict) else []
+        worklist = deque([(data, result)])
+        while worklist:
+            source, target = worklist.popleft()
+            if isinstance(source, dict):
+                for key, value in source.items():
+                    if is_sensitive_key(key):
+                        continue
+                    if isinstance(value, dict):
+                        target[key] = child = {}
+                        worklist.append((value, child))
+                    elif isinstance(value, list):
+                        target[key] = child = []
+                        worklist.append((value, child))
+                    else:
+                        target[key] = value
+            else:
+                for item in source:
+                    if isinstance(item, dict):
+                        child = {}
+                        worklist.append((item, child))
+                    elif isinstance(item, list):
+                        child = []
+                        worklist.append((item, child))
+                    else:
+                        child = item
+                    target.append(child)
+
+        return result
     
     @staticmethod
     def _is_sensitive_key(key: str) -> bool:
         """检查键是否包含敏感信息"""
-        sensitive_patterns = ["api_key", "token", "password", "secret", "auth"]
-        return any(pattern in key.lower() for pattern in sensitive_patterns)
\ No newline at end of file
+        lowered = key.lower()
+        return lowered in _SENSITIVE_EXACT_KEYS or _SENSITIVE_RE.search(lowered) is not None
\ No newline at end of file
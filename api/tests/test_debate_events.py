@@ -0,0 +1,45 @@
+import asyncio
+import threading
+import unittest
+
+from app.utils.debate_events import DebateEventBus
+
+
+class TestDebateEventBus(unittest.IsolatedAsyncioTestCase):
+    """DebateEventBus 的測試用例"""
+
+    async def test_wait_returns_immediately_when_version_changed(self):
+        """版本號已變化時不等待"""
+        bus = DebateEventBus()
+        bus.publish("s1")
+
+        version = await asyncio.wait_for(bus.wait_for_change("s1", 0, 5), 1)
+
+        self.assertEqual(version, 1)
+
+    async def test_publish_from_another_thread_wakes_waiter(self):
+        """背景執行緒中的 publish 喚醒事件迴圈上的等待者"""
+        bus = DebateEventBus()
+        waiter = asyncio.create_task(bus.wait_for_change("s1", 0, 5))
+        await asyncio.sleep(0)
+
+        publisher = threading.Thread(target=bus.publish, args=("s1",))
+        publisher.start()
+        version = await asyncio.wait_for(waiter, 1)
+        publisher.join()
+
+        self.assertEqual(version, 1)
+        self.assertEqual(bus._waiters, {})
+
+    async def test_wait_times_out_without_change(self):
+        """無變化時逾時返回原版本號並清除等待者"""
+        bus = DebateEventBus()
+
+        version = await bus.wait_for_change("s1", 0, 0.01)
+
+        self.assertEqual(version, 0)
+        self.assertEqual(bus._waiters, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.etag import ETagMiddleware
+
+
+async def _status(request):
+    return JSONResponse({"status": "running", "progress": 50})
+
+
+async def _with_cookies(request):
+    response = JSONResponse({"status": "running"})
+    response.set_cookie("a", "1")
+    response.set_cookie("b", "2")
+    return response
+
+
+async def _health(request):
+    return JSONResponse({"status": "healthy"})
+
+
+async def _events(request):
+    async def stream():
+        yield "event: status\ndata: {}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+class TestETagMiddleware(unittest.TestCase):
+    """ETagMiddleware 的測試用例"""
+
+    def setUp(self):
+        app = Starlette(routes=[
+            Route("/api/debate/s1/status", _status),
+            Route("/api/debate/s1/history", _with_cookies),
+            Route("/api/debate/s1/events", _events),
+            Route("/api/health", _health),
+        ])
+        app.add_middleware(ETagMiddleware)
+        self.client = TestClient(app)
+
+    def test_json_response_gets_etag(self):
+        """GET 的 JSON 回應帶有 ETag，內容不變"""
+        response = self.client.get("/api/debate/s1/status")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["ETag"].startswith('W/"'))
+        self.assertEqual(response.json(), {"status": "running", "progress": 50})
+
+    def test_if_none_match_returns_not_modified(self):
+        """If-None-Match 與目前 ETag 相同時回應 304 且沒有內容"""
+        etag = self.client.get("/api/debate/s1/status").headers["ETag"]
+
+        response = self.client.get("/api/debate/s1/status", headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_stale_etag_returns_full_response(self):
+        """If-None-Match 不相符時回傳完整內容"""
+        response = self.client.get("/api/debate/s1/status", headers={"If-None-Match": 'W/"stale"'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "running")
+
+    def test_if_none_match_list_and_wildcard(self):
+        """If-None-Match 以逗號分隔清單或 * 比對，不做子字串比對"""
+        etag = self.client.get("/api/debate/s1/status").headers["ETag"]
+
+        listed = self.client.get("/api/debate/s1/status", headers={"If-None-Match": f'W/"other", {etag}'})
+        wildcard = self.client.get("/api/debate/s1/status", headers={"If-None-Match": "*"})
+        strong = self.client.get("/api/debate/s1/status", headers={"If-None-Match": etag[2:]})
+        substring = self.client.get("/api/debate/s1/status", headers={"If-None-Match": "x" + etag})
+
+        self.assertEqual(listed.status_code, 304)
+        self.assertEqual(wildcard.status_code, 304)
+        self.assertEqual(strong.status_code, 304)
+        self.assertEqual(substring.status_code, 200)
+
+    def test_repeated_headers_are_kept(self):
+        """重複的標頭（例如多個 Set-Cookie）不會被合併"""
+        response = self.client.get("/api/debate/s1/history")
+
+        self.assertIn("ETag", response.headers)
+        self.assertEqual(len(response.headers.get_list("set-cookie")), 2)
+
+    def test_unpolled_path_passes_through(self):
+        """非輪詢端點的 JSON 回應不加 ETag"""
+        response = self.client.get("/api/health")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response.headers)
+
+    def test_streaming_response_passes_through(self):
+        """SSE 串流回應不加 ETag，內容原樣傳遞"""
+        response = self.client.get("/api/debate/s1/events")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response.headers)
+        self.assertEqual(response.text, "event: status\ndata: {}\n\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import json
 from unittest.mock import patch, MagicMock
 from datetime import datetime
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional
 
 # 导入被测试的类和相关模块
@@ -9,48 +10,62 @@ from app.utils.response_parser import ResponseParser
 from app.models.schemas import N8NOptimizedResponse
 
 
+# 模块级常量：时间戳与对话历史只在导入时构建一次
+_TS1 = datetime(2023, 1, 1, 10, 0, 0)
+_TS2 = datetime(2023, 1, 1, 10, 5, 0)
+_TS3 = datetime(2023, 1, 1, 10, 10, 0)
+_TS1_ISO = _TS1.isoformat()
+_TS2_ISO = _TS2.isoformat()
+_TS3_ISO = _TS3.isoformat()
+
+_CONVERSATION_HISTORY = tuple(
+    MappingProxyType(message) for message in (
+        {
+            "role": "expert",
+            "agent": "EconomistAgent",
+            "response": "我认为经济复苏将持续到明年",
+            "round": 1,
+            "timestamp": _TS1
+        },
+        {
+            "role": "skeptic",
+            "agent": "CriticalAgent",
+            "response": "我对这个观点持保留态度，存在下行风险",
+            "round": 1,
+            "timestamp": _TS2
+        },
+        {
+            "role": "expert",
+            "agent": "EconomistAgent",
+            "response": "最新数据支持我的乐观预测",
+            "round": 2,
+            "timestamp": _TS3
+        }
+    )
+)
+
+
 class TestResponseParser(unittest.TestCase):
-    def setUp(self):
-        # 准备测试数据
-        self.session_id = "test-session-123"
-        self.conversation_history = [
-            {
-                "role": "expert",
-                "agent": "EconomistAgent",
-                "response": "我认为经济复苏将持续到明年",
-                "round": 1,
-                "timestamp": datetime(2023, 1, 1, 10, 0, 0)
-            },
-            {
-                "role": "skeptic",
-                "agent": "CriticalAgent",
-                "response": "我对这个观点持保留态度，存在下行风险",
-                "round": 1,
-                "timestamp": datetime(2023, 1, 1, 10, 5, 0)
-            },
-            {
-                "role": "expert",
-                "agent": "EconomistAgent",
-                "response": "最新数据支持我的乐观预测",
-                "round": 2,
-                "timestamp": datetime(2023, 1, 1, 10, 10, 0)
-            }
-        ]
+    @classmethod
+    def setUpClass(cls):
+        # 准备测试数据（只构建一次，各测试只读共享）
+        cls.session_id = "test-session-123"
+        cls.conversation_history = _CONVERSATION_HISTORY
         
-        self.preliminary_insights = [
+        cls.preliminary_insights = [
             "专家认为经济将持续复苏",
             "批评者指出存在下行风险"
         ]
         
-        self.final_conclusion = "综合各方观点，经济复苏大概率将持续，但需警惕潜在风险"
+        cls.final_conclusion = "综合各方观点，经济复苏大概率将持续，但需警惕潜在风险"
         
-        self.key_arguments = {
+        cls.key_arguments = {
             "expert": ["经济复苏将持续到明年", "最新数据支持乐观预测"],
             "skeptic": ["存在下行风险"]
         }
         
-        self.consensus_points = ["经济正在复苏", "存在一定不确定性"]
-        self.divergent_views = ["复苏力度和持续性存在分歧"]
+        cls.consensus_points = ["经济正在复苏", "存在一定不确定性"]
+        cls.divergent_views = ["复苏力度和持续性存在分歧"]
     
     def test_parse_debate_result_to_n8n_format(self):
         """测试将辩论结果解析为n8n优化的响应格式"""
@@ -110,7 +125,7 @@ class TestResponseParser(unittest.TestCase):
         
         self.assertEqual(error_response["detail"], "API调用失败")
         self.assertEqual(error_response["error_code"], "API_ERROR")
-        self.assertTrue("timestamp" in error_response)
+        self.assertIn("timestamp", error_response)
         
         # 测试不带错误码的情况
         error_response_no_code = ResponseParser.format_error_response(
@@ -118,8 +133,8 @@ class TestResponseParser(unittest.TestCase):
         )
         
         self.assertEqual(error_response_no_code["detail"], "未知错误")
-        self.assertTrue("timestamp" in error_response_no_code)
-        self.assertTrue("error_code" not in error_response_no_code)
+        self.assertIn("timestamp", error_response_no_code)
+        self.assertNotIn("error_code", error_response_no_code)
     
     def test_extract_key_arguments_by_role(self):
         """测试从对话历史中提取按角色分类的关键论点"""
@@ -176,6 +191,10 @@ class TestResponseParser(unittest.TestCase):
         self.assertEqual(result[0]["agent_role"], "expert")
         self.assertEqual(result[0]["round"], 1)
         self.assertEqual(result[0]["content"], "我认为经济复苏将持续到明年")
+        self.assertEqual(
+            [msg["timestamp"] for msg in result],
+            [_TS1_ISO, _TS2_ISO, _TS3_ISO]
+        )
     
     def test_validate_response_format(self):
         """测试验证响应格式是否符合预期"""
@@ -221,23 +240,23 @@ class TestResponseParser(unittest.TestCase):
         sanitized = ResponseParser.sanitize_response_data(sensitive_data)
         
         # 验证敏感字段已被移除
-        self.assertFalse("api_key" in sanitized)
-        self.assertFalse("token" in sanitized)
-        self.assertFalse("password" in sanitized)
-        self.assertFalse("auth_token" in sanitized)
+        self.assertNotIn("api_key", sanitized)
+        self.assertNotIn("token", sanitized)
+        self.assertNotIn("password", sanitized)
+        self.assertNotIn("auth_token", sanitized)
         
         # 验证正常字段保留
         self.assertEqual(sanitized["normal_field"], "normal_value")
         
         # 验证嵌套结构中的敏感字段已被移除
-        self.assertFalse("secret_key" in sanitized["nested"])
+        self.assertNotIn("secret_key", sanitized["nested"])
         self.assertEqual(sanitized["nested"]["safe_field"], "safe-value")
         
         # 验证列表中的敏感字段已被移除
         self.assertEqual(len(sanitized["list_with_secrets"]), 2)
-        self.assertFalse("api_key" in sanitized["list_with_secrets"][0])
+        self.assertNotIn("api_key", sanitized["list_with_secrets"][0])
         self.assertEqual(sanitized["list_with_secrets"][0]["name"], "item1")
-        self.assertFalse("password_hash" in sanitized["list_with_secrets"][1])
+        self.assertNotIn("password_hash", sanitized["list_with_secrets"][1])
         self.assertEqual(sanitized["list_with_secrets"][1]["safe"], "value")
     
     def test_is_sensitive_key(self):
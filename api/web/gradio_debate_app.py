@@ -7,9 +7,17 @@ AgentScope 金融分析師辯論系統 - Gradio Web介面
 
 import gradio as gr
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
+import re
 import time
+import functools
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 from pathlib import Path
@@ -27,6 +35,54 @@ logger = logging.getLogger(__name__)
 # API 請求設定常數
 DEFAULT_TIMEOUT = 10  # 預設超時時間10秒
 
+# 共用的 HTTP 會話：重用 keep-alive 連線，避免每次請求重新建立 TCP 連線
+# 連線錯誤時對冪等方法重試（urllib3 預設不重試 POST）
+# 每個主機的連線池需容納並行的UI事件（含長時間佔用連線的進度串流），否則多出的連線用完即丟
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+_http_session.mount("http://", _http_adapter)
+_http_session.mount("https://", _http_adapter)
+
+# GET 回應的 ETag 快取：含查詢參數的完整 URL -> (etag, 原始回應內容)，用於輪詢時的條件請求
+# 只保存位元組，200 時不額外解析、304 時不重新序列化，呼叫端照常解析一次
+# 依最近使用順序保留，超過上限時淘汰最久未用的項目
+ETAG_CACHE_MAX_ENTRIES = 256
+_etag_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_etag_cache_lock = threading.Lock()
+
+def _etag_cache_get(key: str) -> Optional[tuple]:
+    """取得 ETag 快取項目並標記為最近使用"""
+    with _etag_cache_lock:
+        entry = _etag_cache.get(key)
+        if entry is not None:
+            _etag_cache.move_to_end(key)
+        return entry
+
+def _etag_cache_put(key: str, etag: str, content: bytes) -> None:
+    """寫入 ETag 快取項目，超過上限時淘汰最久未用的項目"""
+    with _etag_cache_lock:
+        _etag_cache[key] = (etag, content)
+        _etag_cache.move_to_end(key)
+        while len(_etag_cache) > ETAG_CACHE_MAX_ENTRIES:
+            _etag_cache.popitem(last=False)
+
+def _response_from_cached_content(response: requests.Response, content: bytes) -> requests.Response:
+    """以快取的回應內容建立 200 回應，取代伺服器回傳的 304 空回應"""
+    cached = requests.Response()
+    cached.status_code = 200
+    cached.reason = "OK"
+    cached.headers = response.headers
+    cached.headers["Content-Type"] = "application/json"
+    cached._content = content
+    cached.encoding = "utf-8"
+    cached.url = response.url
+    cached.request = response.request
+    return cached
+
 def make_api_request(method: str, url: str, **kwargs) -> requests.Response:
     """
     統一的API請求函式，包含超時設定和錯誤處理
@@ -51,15 +107,24 @@ def make_api_request(method: str, url: str, **kwargs) -> requests.Response:
     if method not in ['GET', 'POST', 'PUT', 'DELETE']:
         raise ValueError(f"不支援的HTTP方法: {method}")
 
+    # 對一般 GET 帶上 If-None-Match；內容未變化時伺服器回 304，直接沿用快取的回應內容
+    # 快取鍵包含查詢參數，同一路徑的不同查詢不會共用快取
+    conditional = method == 'GET' and not kwargs.get('stream')
+    cache_key = requests.Request(method, url, params=kwargs.get('params')).prepare().url if conditional else None
+    cached = _etag_cache_get(cache_key) if conditional else None
+    if cached:
+        kwargs['headers'] = {**(kwargs.get('headers') or {}), 'If-None-Match': cached[0]}
+
     try:
-        if method == 'GET':
-            response = requests.get(url, **kwargs)
-        elif method == 'POST':
-            response = requests.post(url, **kwargs)
-        elif method == 'PUT':
-            response = requests.put(url, **kwargs)
-        elif method == 'DELETE':
-            response = requests.delete(url, **kwargs)
+        response = _http_session.request(method, url, **kwargs)
+
+        if conditional:
+            if response.status_code == 304 and cached:
+                return _response_from_cached_content(response, cached[1])
+            etag = response.headers.get("ETag")
+            # 非 JSON 內容不做條件請求快取
+            if response.status_code == 200 and etag and "json" in response.headers.get("Content-Type", ""):
+                _etag_cache_put(cache_key, etag, response.content)
 
         # 如果請求失敗，記錄更多資訊
         if not response.ok:
@@ -153,6 +218,85 @@ def handle_api_error(response: requests.Response, operation: str) -> str:
 
     return f"❌ {operation}失敗: {error_msg}"
 
+# 事件流設定：讀取逾時需大於伺服器端心跳間隔（15秒）
+EVENT_STREAM_READ_TIMEOUT = 30
+# 事件流不可用時，退回輪詢 /status 的間隔（秒）
+STATUS_POLL_INTERVAL = 5
+# 輪詢時連續請求失敗達此次數才放棄
+STATUS_POLL_MAX_FAILURES = 3
+TERMINAL_DEBATE_STATUSES = ("completed", "failed", "expired")
+
+def iter_debate_events(session_id: str):
+    """
+    訂閱辯論事件流，逐一產生狀態事件
+
+    優先連線 API 的 SSE 端點 `/debate/{id}/events`，僅在狀態或歷史變化時收到推送；
+    若握手失敗（舊版 API 或代理不支援串流），或事件流在辯論結束前中斷，
+    退回以固定間隔輪詢 `/status`，且只在狀態內容變化時才產生事件。
+    輪詢時的暫時性連線錯誤會重試，連續失敗 STATUS_POLL_MAX_FAILURES 次才拋出。
+
+    Args:
+        session_id: 辯論會話ID
+
+    Yields:
+        dict: 狀態事件。SSE 事件另含 `history` 欄位，只包含新增的發言
+    """
+    try:
+        response = make_api_request(
+            'GET',
+            f"{base_url}/debate/{session_id}/events",
+            stream=True,
+            timeout=(DEFAULT_TIMEOUT, EVENT_STREAM_READ_TIMEOUT),
+            headers={"Accept": "text/event-stream"}
+        )
+    except requests.RequestException:
+        response = None
+
+    if response is not None and response.status_code == 200:
+        last_event_status = None
+        try:
+            with response:
+                response.encoding = "utf-8"
+                data_lines = []
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith("data:"):
+                        data_lines.append(line[5:].lstrip())
+                    elif not line and data_lines:
+                        # 空行代表一個事件結束；以冒號開頭的心跳註解直接略過
+                        event = json.loads("\n".join(data_lines))
+                        data_lines = []
+                        last_event_status = event.get("status")
+                        yield event
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"辯論事件流中斷: {session_id}, 錯誤: {e}")
+        if last_event_status in TERMINAL_DEBATE_STATUSES:
+            return
+        logger.warning(f"辯論事件流在辯論結束前中斷，改為輪詢狀態: {session_id}")
+    else:
+        logger.warning(f"辯論事件流不可用，改為輪詢狀態: {session_id}")
+
+    last_status = None
+    failures = 0
+    while True:
+        try:
+            status_response = make_api_request('GET', f"{base_url}/debate/{session_id}/status")
+        except requests.RequestException:
+            failures += 1
+            if failures >= STATUS_POLL_MAX_FAILURES:
+                raise
+            time.sleep(STATUS_POLL_INTERVAL)
+            continue
+        failures = 0
+        if status_response.status_code != 200:
+            return
+        status = safe_json_parse(status_response)
+        if status != last_status:
+            yield status
+            last_status = status
+        if status.get("status") in TERMINAL_DEBATE_STATUSES:
+            return
+        time.sleep(STATUS_POLL_INTERVAL)
+
 # 設定（嚴格依賴 .env，不提供程式碼內預設值）
 API_BASE_URL = os.environ["API_BASE_URL"]
 OLLAMA_HOST = os.environ.get("OLLAMA_HOST", os.environ.get("OLLAMA_API_BASE"))
@@ -191,6 +335,9 @@ DEFAULT_AGENTS = [
     }
 ]
 
+# 預設智慧體範本的JSON文字，內容固定，載入時序列化一次
+_DEFAULT_AGENTS_JSON = json.dumps(DEFAULT_AGENTS, ensure_ascii=False, indent=2)
+
 class DebateManager:
     def __init__(self):
         self.agents = []
@@ -460,6 +607,34 @@ selected_debate_agents = []
 # 全域辯論管理器實例
 debate_manager = DebateManager()
 
+# 最近一次取得的Agent完整資料：agent_id -> Agent JSON，由 get_agents_for_selection 填充，
+# 讓 load_agent_to_form 在一般操作流程中不必再逐一呼叫 GET /agents/{id}
+_agent_full_cache: Dict[str, Dict[str, Any]] = {}
+
+# Agent選項標籤 -> Agent ID，由 get_agents_for_selection 填充，呼叫端免去字串解析
+_agent_option_ids: Dict[str, str] = {}
+
+def _agent_id_from_option(option: str) -> str:
+    """從 "名稱 (角色) - ID: xxx" 格式的選項取得Agent ID，未知的標籤才從右側切分一次"""
+    agent_id = _agent_option_ids.get(option)
+    if agent_id is None:
+        agent_id = option.rsplit(" - ID: ", 1)[-1]
+    return agent_id
+
+@functools.lru_cache(maxsize=256)
+def _cached_agent_details(agent_id: str) -> Dict[str, Any]:
+    """
+    快取的Agent詳細資訊查詢，同一ID在多次渲染歷史記錄時只向API查詢一次
+
+    辯論參與者都是從Agent列表中選出的，先查 _agent_full_cache 中列表已帶回的完整資料，
+    未命中才呼叫API。查詢失敗時拋出 LookupError 而不是返回 None，使失敗結果不被快取，
+    下次渲染會重試。Agent 被儲存、刪除或列表重新整理時呼叫 cache_clear() 失效。
+    """
+    details = _agent_full_cache.get(agent_id) or debate_manager.get_agent_details(agent_id)
+    if not details:
+        raise LookupError(agent_id)
+    return details
+
 def get_debate_agents_for_selection():    
     """取得可用於辯論的Agent列表"""
     try:
@@ -601,49 +776,92 @@ def create_default_agents_action():
     except Exception as e:
         return f"❌ 建立預設 Agent 時發生未知錯誤: {str(e)}", gr.update(), gr.update()
 
+# 批次設定或刪除Agent時的最大並行請求數
+MAX_PARALLEL_AGENT_REQUESTS = 8
+
+def _configure_debate_agent(agent_id: str, topic: str) -> requests.Response:
+    """為辯論設定單一Agent - 直接API呼叫"""
+    logger.info(f"--- 開始操作：為辯論設定Agent ---")
+    url = f"{base_url}/agents/{agent_id}/configure"
+    logger.info(f"即將呼叫 POST: {url}")
+    config_payload = {
+        "debate_topic": topic,
+        "additional_instructions": "請基於你的專業領域和知識，對辯論主題發表專業觀點，提供具體的資料、案例和分析支援你的觀點。",
+        "llm_config": {
+            "model_name": DEFAULT_MODEL_NAME,
+            "temperature": 0.7,
+            "max_tokens": 1024
+        }
+    }
+    return make_api_request(
+        'POST',
+        url,
+        json=config_payload,
+        headers={"Content-Type": "application/json"}
+    )
+
+def _prefetch_debate_agent_details(agent_ids: List[str]) -> None:
+    """
+    辯論啟動後預先載入所有參與者的詳細資訊到 _cached_agent_details
+
+    參與者在辯論期間固定不變，啟動時一次並行取齊，之後渲染歷史記錄只會命中快取。
+    個別查詢失敗不影響辯論，渲染時會再重試。
+    在背景執行緒中呼叫（見 start_debate_async），不延遲辯論啟動的回應。
+    """
+    def prefetch(agent_id: str) -> None:
+        try:
+            _cached_agent_details(agent_id)
+        except LookupError:
+            logger.warning(f"預先載入Agent {agent_id} 詳細資訊失敗")
+
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_AGENT_REQUESTS, len(agent_ids))) as executor:
+        list(executor.map(prefetch, agent_ids))
+
 def start_debate_async(topic: str, rounds: int, moderator_agent: str, moderator_prompt: str, debate_team: List[str]) -> tuple:
-    """非同步啟動辯論"""
+    """
+    非同步啟動辯論
+
+    Returns:
+        tuple: 各UI元件的更新，最後一項為新會話ID（啟動失敗時為 None），
+               供後續的 stream_debate_progress 判斷是否需要訂閱進度
+    """
     try:
         # 清空之前的辯論進度和歷史記錄
         empty_progress = gr.update(value="")
         empty_history = gr.update(value="")
         
         if not topic.strip():
-            return "❌ 辯論主題不能為空，請輸入辯論主題。", gr.update(), gr.update(), gr.update(), empty_progress, empty_history
+            return "❌ 辯論主題不能為空，請輸入辯論主題。", gr.update(), gr.update(), gr.update(), empty_progress, empty_history, None
         if not moderator_agent:
-            return "❌ 請選擇一位主席才能啟動辯論。", gr.update(), gr.update(), gr.update(), empty_progress, empty_history
+            return "❌ 請選擇一位主席才能啟動辯論。", gr.update(), gr.update(), gr.update(), empty_progress, empty_history, None
         if not debate_team or len(debate_team) < 2:
-            return "❌ 請至少選擇兩位辯論團隊成員才能啟動辯論。", gr.update(), gr.update(), gr.update(), empty_progress, empty_history
+            return "❌ 請至少選擇兩位辯論團隊成員才能啟動辯論。", gr.update(), gr.update(), gr.update(), empty_progress, empty_history, None
 
         # 解析ID
-        moderator_id = str(moderator_agent).split(" - ID: ")[-1]
-        team_ids = [str(agent).split(" - ID: ")[-1] for agent in debate_team]
+        moderator_id = _agent_id_from_option(str(moderator_agent))
+        team_ids = [_agent_id_from_option(str(agent)) for agent in debate_team]
         
         agent_ids = [moderator_id] + team_ids
 
         # 設定Agent用於辯論 - 直接API呼叫
-        for agent_id in agent_ids:
-            logger.info(f"--- 開始操作：為辯論設定Agent ---")
-            url = f"{base_url}/agents/{agent_id}/configure"
-            logger.info(f"即將呼叫 POST: {url}")
-            config_payload = {
-                "debate_topic": topic,
-                "additional_instructions": "請基於你的專業領域和知識，對辯論主題發表專業觀點，提供具體的資料、案例和分析支援你的觀點。",
-                "llm_config": {
-                    "model_name": DEFAULT_MODEL_NAME,
-                    "temperature": 0.7,
-                    "max_tokens": 1024
-                }
-            }
-            config_response = make_api_request(
-                'POST',
-                url,
-                json=config_payload,
-                headers={"Content-Type": "application/json"}
-            )
-            if config_response.status_code != 200:
-                error_msg = handle_api_error(config_response, f"設定Agent {agent_id}")
-                return f"❌ 設定Agent {agent_id} 失敗: {error_msg}", gr.update(), gr.update(), gr.update(), empty_progress, empty_history
+        # 各Agent的設定互不相依，並行送出；結果依主席、團隊成員的順序檢查，
+        # 回報的一律是此順序中第一個失敗的Agent，並取消尚未送出的設定請求，不等待已送出的請求完成
+        executor = ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_AGENT_REQUESTS, len(agent_ids)))
+        try:
+            config_futures = [
+                executor.submit(_configure_debate_agent, agent_id, topic)
+                for agent_id in agent_ids
+            ]
+            for config_future, agent_id in zip(config_futures, agent_ids):
+                try:
+                    config_response = config_future.result()
+                except requests.RequestException as e:
+                    return f"❌ 設定Agent {agent_id} 失敗: {str(e)}", gr.update(), gr.update(), gr.update(), empty_progress, empty_history, None
+                if config_response.status_code != 200:
+                    error_msg = handle_api_error(config_response, f"設定Agent {agent_id}")
+                    return f"❌ 設定Agent {agent_id} 失敗: {error_msg}", gr.update(), gr.update(), gr.update(), empty_progress, empty_history, None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
         # 啟動辯論 - 直接API呼叫
         logger.info(f"--- 開始操作：啟動辯論 ---")
@@ -676,20 +894,103 @@ def start_debate_async(topic: str, rounds: int, moderator_agent: str, moderator_
                 # 更新全域session_id用於後續操作
                 global current_session_id
                 current_session_id = session_id
-                return f"✅ 辯論啟動成功！會話ID: {session_id}", gr.update(interactive=False), gr.update(visible=True), gr.update(selected="📊 辯論進度"), empty_progress, empty_history
+                # 在背景預先載入參與者資訊，不等待結果
+                threading.Thread(target=_prefetch_debate_agent_details, args=(agent_ids,), daemon=True).start()
+                return f"✅ 辯論啟動成功！會話ID: {session_id}", gr.update(interactive=False), gr.update(visible=True), gr.update(selected="📊 辯論進度"), empty_progress, empty_history, session_id
             else:
-                return "❌ 辯論啟動失敗: API未返回session_id", gr.update(), gr.update(), gr.update(), empty_progress, empty_history
+                return "❌ 辯論啟動失敗: API未返回session_id", gr.update(), gr.update(), gr.update(), empty_progress, empty_history, None
         else:
             error_msg = handle_api_error(debate_response, "辯論啟動")
-            return f"❌ 辯論啟動失敗: {error_msg}", gr.update(), gr.update(), gr.update(), empty_progress, empty_history
+            return f"❌ 辯論啟動失敗: {error_msg}", gr.update(), gr.update(), gr.update(), empty_progress, empty_history, None
     except Exception as e:
         logger.error(f"啟動辯論時出錯: {e}", exc_info=True)
-        return f"❌ 啟動辯論時出錯: {str(e)}", gr.update(), gr.update(), gr.update(), empty_progress, empty_history
+        return f"❌ 啟動辯論時出錯: {str(e)}", gr.update(), gr.update(), gr.update(), empty_progress, empty_history, None
+
+# 已結束辯論的結果快取：session_id -> 結果字典
+# API 只在辯論完成或失敗後才返回 200，結果此後不再變化，每個會話只需取得一次
+# 依最近使用順序保留，超過上限時淘汰最久未用的會話，長時間運行的程序不會無限增長
+DEBATE_RESULT_CACHE_MAX_ENTRIES = 32
+_debate_result_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_debate_result_cache_lock = threading.Lock()
+
+def _fetch_debate_result(session_id: str) -> Optional[Dict[str, Any]]:
+    """取得辯論結果 - 直接API呼叫，辯論尚未結束或請求失敗時返回 None"""
+    with _debate_result_cache_lock:
+        result = _debate_result_cache.get(session_id)
+        if result is not None:
+            _debate_result_cache.move_to_end(session_id)
+            return result
+
+    result_response = make_api_request('GET', f"{base_url}/debate/{session_id}/result")
+    if result_response.status_code != 200:
+        return None
+    result_data = safe_json_parse(result_response)
+    # 如果返回的是字典格式，直接使用，否則包裝成字典格式
+    result = result_data if isinstance(result_data, dict) else {"result": result_data}
+    with _debate_result_cache_lock:
+        _debate_result_cache[session_id] = result
+        _debate_result_cache.move_to_end(session_id)
+        while len(_debate_result_cache) > DEBATE_RESULT_CACHE_MAX_ENTRIES:
+            _debate_result_cache.popitem(last=False)
+    return result
+
+def _fetch_final_conclusion(session_id: str) -> str:
+    """取得辯論最終結論，無結果時返回空字串"""
+    result = _fetch_debate_result(session_id)
+    return result.get("final_conclusion", "") if result else ""
+
+def _format_debate_progress(status: Dict[str, Any], history: List[Dict[str, Any]], final_conclusion: str = "") -> str:
+    """將辯論狀態與歷史記錄格式化為進度摘要文字"""
+    current_status = status.get("status", "unknown")
+    current_round = status.get("current_round", 0)
+    total_rounds = status.get("total_rounds", 0)
+    progress_value = status.get("progress", 0)
+
+    progress_info = []
+    progress_info.append("🔄 辯論進度即時監控")
+    progress_info.append("-" * 40)
+    progress_info.append(f"📊 狀態: {current_status}")
+    progress_info.append(f"🎯 輪次: {current_round}/{total_rounds}")
+    progress_info.append(f"📈 進度: {progress_value}%")
+
+    # 顯示參與辯論的Agent資訊
+    if selected_debate_agents:
+        progress_info.append("👥 參與辯論的Agent:")
+        for agent in selected_debate_agents:
+            # 提取Agent名稱和角色資訊
+            if " (" in agent and ") " in agent:
+                agent_name_role = agent.split(" - ID:")[0]
+                progress_info.append(f"  {agent_name_role}")
+
+    if current_status == "running":
+        progress_info.append("\n⏳ 辯論進行中...")
+        if history:
+            # 顯示最近的發言
+            recent_messages = history[-3:]  # 取得最後3條訊息
+            progress_info.append("\n💬 最新發言:")
+            for msg in recent_messages:
+                agent_name = msg.get("agent_name", "未知")
+                content = msg.get("content", "")[:100]
+                round_num = msg.get("round", 1)
+                progress_info.append(f"第{round_num}輪 - {agent_name}: {content}...")
+
+    elif current_status == "completed":
+        progress_info.append("\n✅ 辯論已完成")
+        if final_conclusion:
+            progress_info.append(f"🏆 最終結論: {final_conclusion[:200]}...")
+
+    elif current_status == "failed":
+        progress_info.append("\n❌ 辯論失敗")
+    else:
+        progress_info.append("\n⏸️ 辯論未開始或已暫停")
+
+    progress_info.append(f"\n🕒 更新時間: {datetime.now().strftime('%H:%M:%S')}")
+
+    return "\n".join(progress_info)
 
 def get_debate_progress(history_state: list) -> tuple:
     """取得辯論進度 - 直接API呼叫"""
     global current_session_id
-    global selected_debate_agents
 
     if not globals()['current_session_id']:
         return "暫無進行中的辯論", []
@@ -702,111 +1003,118 @@ def get_debate_progress(history_state: list) -> tuple:
 
         status = safe_json_parse(status_response)
         current_status = status.get("status", "unknown")
-        current_round = status.get("current_round", 0)
-        total_rounds = status.get("total_rounds", 0)
-        progress_value = status.get("progress", 0)
-
-        progress_info = []
-        progress_info.append("🔄 辯論進度即時監控")
-        progress_info.append("-" * 40)
-        progress_info.append(f"📊 狀態: {current_status}")
-        progress_info.append(f"🎯 輪次: {current_round}/{total_rounds}")
-        progress_info.append(f"📈 進度: {progress_value}%")
-
-        # 顯示參與辯論的Agent資訊
-        if selected_debate_agents:
-            progress_info.append("👥 參與辯論的Agent:")
-            for agent in selected_debate_agents:
-                # 提取Agent名稱和角色資訊
-                if " (" in agent and ") " in agent:
-                    agent_name_role = agent.split(" - ID:")[0]
-                    progress_info.append(f"  {agent_name_role}")
 
         history = [] # 初始化 history 變數
+        final_conclusion = ""
 
-        if current_status == "running":
-            progress_info.append("\n⏳ 辯論進行中...")
-            # 取得最新發言 - 直接API呼叫
-            history_response = make_api_request('GET', f"{base_url}/debate/{current_session_id}/history")
-            if history_response.status_code == 200:
-                history_data = safe_json_parse(history_response)
-                # API可能返回列表或包含history鍵的字典
-                if isinstance(history_data, list):
-                    history = history_data
-                elif isinstance(history_data, dict):
-                    history = history_data.get("history", [])
-                else:
-                    history = []
+        if current_status in ("running", "completed"):
+            # 取得歷史記錄 - 直接API呼叫
+            history = _fetch_debate_history(current_session_id)
+        if current_status == "completed":
+            # 顯示最終結果摘要 - 直接API呼叫
+            final_conclusion = _fetch_final_conclusion(current_session_id)
 
-                if history:
-                    # 顯示最近的發言
-                    recent_messages = history[-3:]  # 取得最後3條訊息
-                    progress_info.append("\n💬 最新發言:")
-                    for msg in recent_messages:
-                        agent_name = msg.get("agent_name", "未知")
-                        content = msg.get("content", "")[:100]
-                        round_num = msg.get("round", 1)
-                        progress_info.append(f"第{round_num}輪 - {agent_name}: {content}...")
+        return _format_debate_progress(status, history, final_conclusion), history
 
-        elif current_status == "completed":
-            progress_info.append("\n✅ 辯論已完成")
-            # 在辯論完成時，也嘗試獲取完整的歷史紀錄
-            history_response = make_api_request('GET', f"{base_url}/debate/{current_session_id}/history")
-            if history_response.status_code == 200:
-                history_data = safe_json_parse(history_response)
-                if isinstance(history_data, list):
-                    history = history_data
-                elif isinstance(history_data, dict):
-                    history = history_data.get("history", [])
-                else:
-                    history = []
-            # 顯示最終結果摘要 - 直接API呼叫
-            result_response = make_api_request('GET', f"{base_url}/debate/{current_session_id}/result")
-            if result_response.status_code == 200:
-                result_data = safe_json_parse(result_response)
-                # 如果返回的是字典格式，直接返回
-                if isinstance(result_data, dict):
-                    result = result_data
-                else:
-                    result = {"result": result_data}
+    except Exception as e:
+        return f"❌ 取得進度時出錯: {str(e)}", []
 
-                final_conclusion = result.get("final_conclusion", "")
-                if final_conclusion:
-                    progress_info.append(f"🏆 最終結論: {final_conclusion[:200]}...")
+# 串流進度與取消辯論時重複使用的固定元件更新，Gradio 會複製後再處理，可安全共用
+_NO_UPDATE = gr.update()
+_BUTTON_ENABLE = gr.update(interactive=True)
+_BUTTON_DISABLE = gr.update(interactive=False)
+_BUTTON_SHOW = gr.update(visible=True)
+_BUTTON_HIDE = gr.update(visible=False)
 
-        elif current_status == "failed":
-            progress_info.append("\n❌ 辯論失敗")
-        else:
-            progress_info.append("\n⏸️ 辯論未開始或已暫停")
+def stream_debate_progress(session_id: Optional[str]):
+    """
+    串流辯論進度 - 訂閱事件流的產生器
 
-        progress_info.append(f"\n🕒 更新時間: {datetime.now().strftime('%H:%M:%S')}")
+    接在啟動辯論之後執行，Gradio 在辯論期間保持此事件開啟；
+    伺服器推送狀態或新發言時才產生一次UI更新，取代前端每5秒的全量輪詢。
 
-        return "\n".join(progress_info), history
+    Args:
+        session_id: start_debate_async 返回的會話ID，啟動失敗時為 None
+
+    Yields:
+        tuple: (進度摘要, 最終結果, 完整歷史, 歷史記錄狀態, 啟動按鈕更新, 取消按鈕更新)
+    """
+    if not session_id:
+        # 啟動失敗，保留 start_debate_async 顯示的錯誤訊息
+        return
+
+    history: List[Dict[str, Any]] = []
+    rendered_count = None
+    try:
+        for status in iter_debate_events(session_id):
+            current_status = status.get("status")
+            if "history" in status:
+                # SSE 事件只帶新增的發言，累加即可
+                history.extend(status["history"])
+            elif current_status in ("running", "completed"):
+                # 輪詢模式的狀態不含歷史，狀態變化時才重新取得
+                history = _fetch_debate_history(session_id)
+
+            # 僅狀態或進度變化而沒有新發言時，不重送整份歷史文字，避免大型文字框整段重繪
+            if len(history) != rendered_count:
+                full_history_text = format_debate_history(history, session_id=session_id)
+                rendered_count = len(history)
+            else:
+                full_history_text = _NO_UPDATE
+
+            if current_status in TERMINAL_DEBATE_STATUSES:
+                final_conclusion = _fetch_final_conclusion(session_id) if current_status == "completed" else ""
+                yield (
+                    _format_debate_progress(status, history, final_conclusion),
+                    get_debate_results(session_id),
+                    full_history_text,
+                    history,
+                    _BUTTON_ENABLE,  # 啟用啟動辯論按鈕
+                    _BUTTON_HIDE  # 隱藏取消辯論按鈕
+                )
+                return
+
+            # 辯論進行中，只更新進度，保持按鈕狀態
+            yield (
+                _format_debate_progress(status, history),
+                _NO_UPDATE,
+                full_history_text,
+                history,
+                _BUTTON_DISABLE,
+                _BUTTON_SHOW
+            )
 
     except Exception as e:
-        return f"❌ 取得進度時出錯: {str(e)}", []
+        logger.error(f"串流辯論進度時出錯: {e}", exc_info=True)
+        yield (
+            f"❌ 取得進度時出錯: {str(e)}",
+            _NO_UPDATE,
+            _NO_UPDATE,
+            history,
+            _BUTTON_ENABLE,
+            _BUTTON_HIDE
+        )
 
-def get_debate_results() -> str:
-    """取得辯論結果 - 直接API呼叫"""
-    global current_session_id
+def get_debate_results(session_id: Optional[str] = None) -> str:
+    """
+    取得辯論結果 - 直接API呼叫
+
+    Args:
+        session_id: 辯論會話ID，省略時使用目前的會話；
+                    串流進度時傳入自己訂閱的會話，避免其他分頁啟動的辯論取代結果
+    """
+    session_id = session_id or current_session_id
 
     try:
         # 首先嘗試取得完整結果 - 直接API呼叫
-        if current_session_id:
-            result_response = make_api_request('GET', f"{base_url}/debate/{current_session_id}/result")
-            if result_response.status_code == 200:
-                result_data = safe_json_parse(result_response)
-                # 如果返回的是字典格式，直接返回
-                if isinstance(result_data, dict):
-                    return format_debate_result(result_data)
-                else:
-                    # 嘗試包裝成字典格式
-                    wrapped_result = {"result": result_data}
-                    return format_debate_result(wrapped_result)
+        if session_id:
+            result = _fetch_debate_result(session_id)
+            if result is not None:
+                return format_debate_result(result)
 
         # 如果沒有完整結果，取得歷史記錄 - 直接API呼叫
-        if current_session_id:
-            history_response = make_api_request('GET', f"{base_url}/debate/{current_session_id}/history")
+        if session_id:
+            history_response = make_api_request('GET', f"{base_url}/debate/{session_id}/history")
             if history_response.status_code == 200:
                 history_data = safe_json_parse(history_response)
                 # API可能返回列表或包含history鍵的字典
@@ -818,7 +1126,7 @@ def get_debate_results() -> str:
                     history = []
 
                 if history:
-                    return format_debate_history(history)
+                    return format_debate_history(history, session_id=session_id)
 
         return "❌ 暫無辯論結果"
 
@@ -860,64 +1168,186 @@ def format_debate_result(result_data: Dict[str, Any]) -> str:
 
     return "\n".join(results)
 
-def format_debate_history(history: List[Dict[str, Any]]) -> str:
-    """格式化辯論歷史記錄"""
+# 辯論歷史的 agent_name 欄位可能是 Agent ID（UUID），只有完整符合時才向API查詢名稱
+_UUID_RE = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
+    re.IGNORECASE
+)
+
+# 歷史記錄的增量渲染快取：{session_id: (已完成輪次, 已完成輪次的條目數, 其最後一條的指紋, 已渲染的文字)}
+# 已完成輪次的條目必須正好是歷史的前若干條；最新一輪可能仍在追加發言，不快取
+# 多個辯論可同時串流，每個會話各自保留；依最近使用順序保留，超過上限時淘汰最久未用的會話
+HISTORY_RENDER_CACHE_MAX_ENTRIES = 32
+_history_render_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_history_render_cache_lock = threading.Lock()
+
+def _clear_history_render_cache() -> None:
+    """清空歷史記錄渲染快取（Agent名稱可能已變更時使用）"""
+    with _history_render_cache_lock:
+        _history_render_cache.clear()
+
+def _history_fingerprint(entry: Dict[str, Any]) -> tuple:
+    """歷史條目的指紋，用於確認快取的已渲染部分未被改寫"""
+    return (
+        entry.get("agent_id"), entry.get("agent_name"), entry.get("round"),
+        entry.get("timestamp"), entry.get("content")
+    )
+
+def _history_round(entry: Dict[str, Any]) -> Any:
+    """取得歷史條目的輪次，缺少時視為第1輪"""
+    return entry.get("round", 1)
+
+def _selected_agent_names() -> Dict[str, str]:
+    """由已選辯論Agent的選項標籤 "名稱 (角色) - ID: xxx" 建立 agent_id -> 名稱 對照表"""
+    name_by_id = {}
+    for option in selected_debate_agents:
+        label, separator, agent_id = option.rpartition(" - ID: ")
+        if separator and agent_id:
+            name_by_id[agent_id] = label.rsplit(" (", 1)[0]
+    return name_by_id
+
+def _format_history_round(round_num: Any, round_entries, name_by_id: Dict[str, str]) -> List[str]:
+    """格式化單一輪次的歷史記錄行，name_by_id 為已知的 agent_id -> 名稱 對照表"""
+    parts = [f"\n🔄 第 {round_num} 輪", "-" * 30]
+    append = parts.append
+
+    for entry in round_entries:
+        # 從歷史記錄條目中獲取 agent_id 和 agent_name
+        # 根據日誌，agent_name 字段實際上包含了 agent_id
+        # 而 agent_id 字段可能是 "未知"
+        get = entry.get
+        raw_agent_id_from_entry = get("agent_id", "未知")
+        raw_agent_name_from_entry = get("agent_name", "")
+        role = get("agent_role", "未知")
+        content = get("content", "").strip()
+
+        # 判斷哪個字段包含實際的 Agent ID
+        # 優先使用 raw_agent_name_from_entry，因為日誌顯示它包含了 ID
+        actual_agent_id_to_query = ""
+        if raw_agent_name_from_entry and _UUID_RE.match(raw_agent_name_from_entry):
+            actual_agent_id_to_query = raw_agent_name_from_entry
+        elif raw_agent_id_from_entry != "未知":
+            actual_agent_id_to_query = raw_agent_id_from_entry
+
+        display_agent_name = "未知名稱" # 預設顯示名稱
+
+        if actual_agent_id_to_query in name_by_id:
+            display_agent_name = name_by_id[actual_agent_id_to_query]
+        elif actual_agent_id_to_query:
+            try:
+                agent_details = _cached_agent_details(actual_agent_id_to_query)
+            except LookupError:
+                agent_details = None
+            if agent_details and agent_details.get("name"):
+                display_agent_name = agent_details.get("name")
+            else:
+                # 如果無法獲取詳細名稱，則回退到顯示 ID
+                display_agent_name = actual_agent_id_to_query
+        elif raw_agent_name_from_entry:
+            # 如果 raw_agent_name_from_entry 不是 ID 格式，但有值，則直接使用
+            display_agent_name = raw_agent_name_from_entry
+
+        if content:  # 只顯示有內容的條目；標題、內容與空白分隔行合併為一段，每條目只追加一次
+            append(f"👤 {display_agent_name} ({role}):\n{content}\n")
+
+    return parts
+
+def format_debate_history(history: List[Dict[str, Any]], session_id: Optional[str] = None) -> str:
+    """
+    格式化辯論歷史記錄
+
+    Args:
+        history: 辯論歷史記錄
+        session_id: 會話ID；提供時重用先前已渲染的完整輪次，只格式化新增的輪次
+
+    Returns:
+        str: 格式化後的歷史記錄文字
+    """
     if not history:
         return "暫無歷史記錄"
 
-    results = []
-    results.append("📝 辯論歷史記錄")
-    results.append("=" * 50)
+    header = "📝 辯論歷史記錄\n" + "=" * 50
+    done_round, done_count, done_text = None, 0, header
+    if session_id is not None:
+        with _history_render_cache_lock:
+            cached = _history_render_cache.get(session_id)
+            if cached is not None:
+                _history_render_cache.move_to_end(session_id)
+        if cached is not None:
+            cached_round, cached_count, cached_last, cached_text = cached
+            # 辯論歷史只會追加，只比對已渲染部分的最後一條，不走訪整份歷史；
+            # 不符時（歷史被重寫或截短）整份重新渲染
+            if len(history) >= cached_count and _history_fingerprint(history[cached_count - 1]) == cached_last:
+                done_round, done_count, done_text = cached_round, cached_count, cached_text
+
+    pending = history[done_count:]
+    if done_round is not None and any(_history_round(entry) <= done_round for entry in pending):
+        # 新增的發言屬於已渲染的輪次，整份重新渲染
+        done_round, done_count, done_text, pending = None, 0, header, history
+
+    # 按輪次穩定排序後一次分組輸出，同一輪內保持原有發言順序
+    rounds = [
+        (round_num, list(round_entries))
+        for round_num, round_entries in itertools.groupby(sorted(pending, key=_history_round), key=_history_round)
+    ]
+    # 已選辯論Agent的名稱每次呼叫只解析一次，逐條目直接查表
+    name_by_id = _selected_agent_names()
+    parts = [done_text]
+    previous_count = done_count
+    for round_num, round_entries in rounds[:-1]:
+        parts.extend(_format_history_round(round_num, round_entries, name_by_id))
+        done_round, done_count = round_num, done_count + len(round_entries)
+
+    # 最新一輪之前的內容已定稿；只有定稿的條目正好排在歷史最前面時才存入快取，
+    # 下次才能只渲染尾端。之前的部分已檢查過，只需檢查這次新定稿的條目
+    if session_id is not None and done_count > 0:
+        if all(_history_round(entry) <= done_round for entry in history[previous_count:done_count]):
+            done_text = "\n".join(parts)
+            parts = [done_text]
+            with _history_render_cache_lock:
+                _history_render_cache[session_id] = (
+                    done_round, done_count, _history_fingerprint(history[done_count - 1]), done_text
+                )
+                _history_render_cache.move_to_end(session_id)
+                while len(_history_render_cache) > HISTORY_RENDER_CACHE_MAX_ENTRIES:
+                    _history_render_cache.popitem(last=False)
+        else:
+            with _history_render_cache_lock:
+                _history_render_cache.pop(session_id, None)
 
-    # 按輪次分組
-    rounds = {}
-    for entry in history:
-        round_num = entry.get("round", 1)
-        if round_num not in rounds:
-            rounds[round_num] = []
-        rounds[round_num].append(entry)
-
-    # 輸出每輪內容
-    for round_num in sorted(rounds.keys()):
-        results.append(f"\n🔄 第 {round_num} 輪")
-        results.append("-" * 30)
-
-        for entry in rounds[round_num]:
-            # 從歷史記錄條目中獲取 agent_id 和 agent_name
-            # 根據日誌，agent_name 字段實際上包含了 agent_id
-            # 而 agent_id 字段可能是 "未知"
-            raw_agent_id_from_entry = entry.get("agent_id", "未知")
-            raw_agent_name_from_entry = entry.get("agent_name", "")
-            role = entry.get("agent_role", "未知")
-            content = entry.get("content", "").strip()
-
-            # 判斷哪個字段包含實際的 Agent ID
-            # 優先使用 raw_agent_name_from_entry，因為日誌顯示它包含了 ID
-            actual_agent_id_to_query = ""
-            if raw_agent_name_from_entry and "-" in raw_agent_name_from_entry: # 簡單判斷是否為 UUID 格式
-                actual_agent_id_to_query = raw_agent_name_from_entry
-            elif raw_agent_id_from_entry != "未知":
-                actual_agent_id_to_query = raw_agent_id_from_entry
-
-            display_agent_name = "未知名稱" # 預設顯示名稱
-
-            if actual_agent_id_to_query:
-                agent_details = debate_manager.get_agent_details(actual_agent_id_to_query)
-                if agent_details and agent_details.get("name"):
-                    display_agent_name = agent_details.get("name")
-                else:
-                    # 如果無法獲取詳細名稱，則回退到顯示 ID
-                    display_agent_name = actual_agent_id_to_query
-            elif raw_agent_name_from_entry:
-                # 如果 raw_agent_name_from_entry 不是 ID 格式，但有值，則直接使用
-                display_agent_name = raw_agent_name_from_entry
+    if rounds:
+        parts.extend(_format_history_round(*rounds[-1], name_by_id))
 
-            if content:  # 只顯示有內容的條目
-                results.append(f"👤 {display_agent_name} ({role}):")
-                results.append(f"{content}")
-                results.append("")
+    return "\n".join(parts)
 
-    return "\n".join(results)
+def _history_timestamp(entry: Dict[str, Any]) -> Any:
+    """取得歷史條目的時間戳，缺少時視為最舊"""
+    return entry.get("timestamp", "")
+
+def _latest_history_entry(history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    取得最新的歷史條目
+
+    API 按時間順序追加歷史，通常最後一筆即最新，直接取尾端；
+    只有尾端時間戳早於首筆（順序被打亂）時才退回線性掃描。
+    """
+    latest_entry = history[-1]
+    if _history_timestamp(latest_entry) < _history_timestamp(history[0]):
+        latest_entry = max(history, key=_history_timestamp)
+    return latest_entry
+
+def _fetch_debate_history(session_id: str) -> List[Dict[str, Any]]:
+    """取得辯論完整歷史記錄 - 直接API呼叫"""
+    history_response = make_api_request('GET', f"{base_url}/debate/{session_id}/history")
+    if history_response.status_code != 200:
+        return []
+    history_data = safe_json_parse(history_response)
+    # API可能返回列表或包含history鍵的字典
+    if isinstance(history_data, list):
+        return history_data
+    if isinstance(history_data, dict):
+        return history_data.get("history", [])
+    return []
 
 def monitor_debate_status() -> str:
     """監控辯論狀態 - 直接API呼叫"""
@@ -962,7 +1392,7 @@ def monitor_debate_status() -> str:
                 if history:
                     # 取得最新發言
                     try:
-                        latest_entry = max(history, key=lambda x: x.get("timestamp", ""))
+                        latest_entry = _latest_history_entry(history)
                         agent_name = latest_entry.get("agent_name") or latest_entry.get("agent_id", "未知")
                         content_preview = latest_entry.get("content", "")[:100]
                         status_info.append(f"最新發言: {agent_name} - {content_preview}...")
@@ -986,35 +1416,43 @@ def monitor_debate_status() -> str:
 
 def get_agent_templates() -> str:
     """取得智慧體範本JSON"""
-    return json.dumps(DEFAULT_AGENTS, ensure_ascii=False, indent=2)
+    return _DEFAULT_AGENTS_JSON
+
+def _split_comma_list(value: str) -> List[str]:
+    """將逗號分隔字串轉換為去除空白的列表"""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def validate_agent_input(name: str, role: str, system_prompt: str, personality_traits: str, expertise_areas: str) -> tuple:
+    """
+    驗證Agent輸入資料
 
-def validate_agent_input(name: str, role: str, system_prompt: str, personality_traits: str, expertise_areas: str) -> str:
-    """驗證Agent輸入資料，返回錯誤訊息或空字串"""
+    Returns:
+        tuple: (error_msg, personality_list, expertise_list)，驗證通過時 error_msg 為空字串，
+               解析後的列表可直接交給 prepare_agent_payload，不必再次拆分
+    """
     if not name.strip():
-        return "❌ Agent名稱不能為空"
+        return "❌ Agent名稱不能為空", [], []
     if not role.strip():
-        return "❌ 請選擇Agent角色"
+        return "❌ 請選擇Agent角色", [], []
     if not system_prompt.strip():
-        return "❌ 系統提示詞不能為空"
+        return "❌ 系統提示詞不能為空", [], []
     if len(system_prompt.strip()) < 10:
-        return f"❌ 系統提示詞至少需要10個字元（目前{len(system_prompt.strip())}個字元）\n請提供更詳細的角色描述。"
+        return f"❌ 系統提示詞至少需要10個字元（目前{len(system_prompt.strip())}個字元）\n請提供更詳細的角色描述。", [], []
 
     # 轉換字串為列表
-    personality_list = [trait.strip() for trait in personality_traits.split(',') if trait.strip()]
-    expertise_list = [area.strip() for area in expertise_areas.split(',') if area.strip()]
+    personality_list = _split_comma_list(personality_traits)
+    expertise_list = _split_comma_list(expertise_areas)
 
     if not personality_list:
-        return "❌ 請至少填寫一個個性特徵"
+        return "❌ 請至少填寫一個個性特徵", personality_list, expertise_list
     if not expertise_list:
-        return "❌ 請至少填寫一個專業領域"
-
-    return ""  # 驗證通過
+        return "❌ 請至少填寫一個專業領域", personality_list, expertise_list
 
-def prepare_agent_payload(name: str, role: str, system_prompt: str, personality_traits: str, expertise_areas: str) -> dict:
-    """準備Agent API請求資料"""
-    personality_list = [trait.strip() for trait in personality_traits.split(',') if trait.strip()]
-    expertise_list = [area.strip() for area in expertise_areas.split(',') if area.strip()]
+    return "", personality_list, expertise_list  # 驗證通過
 
+def prepare_agent_payload(name: str, role: str, system_prompt: str,
+                          personality_list: List[str], expertise_list: List[str]) -> dict:
+    """準備Agent API請求資料，個性特徵與專業領域為 validate_agent_input 解析好的列表"""
     return {
         "name": name.strip(),
         "role": role.strip(),
@@ -1033,14 +1471,14 @@ def save_agent(agent_id: str, name: str, role: str, system_prompt: str,
     """儲存Agent（建立或更新）"""
     try:
         # 驗證輸入
-        validation_error = validate_agent_input(name, role, system_prompt, personality_traits, expertise_areas)
+        validation_error, personality_list, expertise_list = validate_agent_input(
+            name, role, system_prompt, personality_traits, expertise_areas
+        )
         if validation_error:
             return validation_error, gr.update(), gr.update(), gr.update()
 
-        # 準備API請求資料
-        payload = prepare_agent_payload(name, role, system_prompt, personality_traits, expertise_areas)
-
-        # API請求資料已經在 prepare_agent_payload 中準備好
+        # 準備API請求資料，直接使用驗證時解析好的列表
+        payload = prepare_agent_payload(name, role, system_prompt, personality_list, expertise_list)
 
         # 根據agent_id決定是建立還是更新
         if agent_id and agent_id.strip():
@@ -1072,6 +1510,9 @@ def save_agent(agent_id: str, name: str, role: str, system_prompt: str,
 
         if response.status_code == 200:
             data = safe_json_parse(response)
+            _cached_agent_details.cache_clear()
+            _clear_history_render_cache()
+            _agent_full_cache.clear()
 
             if operation == "建立":
                 agent_id_result = data.get("agent_id")
@@ -1114,32 +1555,37 @@ Agent列表已自動重新整理。
 
 def refresh_agent_list_with_retry() -> tuple:
     """
-    帶重試機制的Agent列表重新整理函式
+    Agent列表重新整理函式
+
+    空列表也是合法狀態（尚未建立任何Agent），因此不做重試，直接計算總數返回。
 
     Returns:
         tuple: (agent_options, count_text) - Agent列表選項和計數器文本
     """
-    max_retries = 3
-    retry_delay = 1
-
-    for attempt in range(max_retries):
-        logger.info(f"=== Agent列表重新整理嘗試 {attempt + 1}/{max_retries} ===")
-
-        agents = get_agents_for_selection()
-        
-        # 日志記錄取得的Agent列表和長度
-        logger.info(f"取得的Agent列表: {agents}")
-        logger.info(f"取得的Agent數量: {len(agents)}")
-
-        # 無論列表是否為空，都計算總數並返回
-        agent_count = len(agents)
-        count_text = f"目前 Agent 總數：{agent_count}"
-        logger.info(f"✅ 第 {attempt + 1} 次嘗試取得 {agent_count} 個Agent")
-        return agents, count_text
+    agents = get_agents_for_selection()
+    count_text = f"目前 Agent 總數：{len(agents)}"
+    logger.info(f"✅ 取得 {len(agents)} 個Agent")
+    return agents, count_text
+
+# 辯論設定頁的Agent選項短暫快取，連續的切換頁籤、選擇主席等操作共用同一次API結果
+AGENT_CHOICES_TTL = 5  # 秒
+_agent_choices_cache: Dict[str, Any] = {"options": None, "fetched_at": 0.0}
+
+def get_cached_agent_choices() -> List[str]:
+    """取得Agent選項，AGENT_CHOICES_TTL 秒內重用 get_agents_for_selection 最近一次的成功結果"""
+    if _agent_choices_cache["options"] is not None and time.monotonic() - _agent_choices_cache["fetched_at"] < AGENT_CHOICES_TTL:
+        return _agent_choices_cache["options"]
+    return get_agents_for_selection()
+
+def refresh_agent_choices() -> tuple:
+    """
+    以同一份Agent選項更新主席與辯論團隊兩個選擇元件
 
-    # 所有重試都失敗（理論上不會到達這裡，因為上面的迴圈總是返回）
-    logger.error("❌ 重試後仍未取得Agent資料，返回空列表")
-    return [], "目前 Agent 總數：0"
+    辯論團隊選項被重設為完整列表，因此一併清除記錄的上一位主席，
+    讓下一次主席變更重新過濾團隊選項。
+    """
+    agents = get_cached_agent_choices()
+    return gr.update(choices=agents), gr.update(choices=agents), None
 
 def get_agents_for_selection() -> List[str]:
     """取得所有Agent用於選擇 - 直接API呼叫"""
@@ -1149,16 +1595,13 @@ def get_agents_for_selection() -> List[str]:
 
         # 直接API呼叫取得Agent列表
         response = make_api_request('GET', f"{base_url}/agents/")
-        agent_options = []
 
         if response.status_code == 200:
             data = safe_json_parse(response)
             logger.info(f"API回應狀態碼: {response.status_code}")
-            logger.info(f"API回應資料類型: {type(data)}")
+            logger.info(f"API回應資料類型: {type(data).__name__}")
 
-            # 詳細記錄API返回の原始資料
             if isinstance(data, list):
-                logger.info(f"API返回原始資料（列表格式）: {json.dumps(data, ensure_ascii=False, indent=2)[:500]}...")
                 agents_list = data
                 logger.info(f"返回列表格式，包含 {len(agents_list)} 個Agent")
             elif isinstance(data, dict):
@@ -1174,19 +1617,27 @@ def get_agents_for_selection() -> List[str]:
                 logger.warning(f"原始資料內容: {str(data)[:200]}...")
                 agents_list = []
 
-            for agent in agents_list:
-                agent_name = agent.get('name', '未知')
-                agent_role = agent.get('role', '未知')
-                agent_id = agent.get('id', '未知')
-                agent_created_at = agent.get('created_at', '未知')
-                agent_status = agent.get('status', '未知')
+            _agent_full_cache.clear()
+            _agent_full_cache.update(
+                (str(agent["id"]), agent) for agent in agents_list if agent.get("id")
+            )
 
-                option = f"{agent_name} ({agent_role}) - ID: {agent_id}"
-                agent_options.append(option)
+            agent_options = [
+                f"{agent.get('name', '未知')} ({agent.get('role', '未知')}) - ID: {agent.get('id', '未知')}"
+                for agent in agents_list
+            ]
 
-                # 詳細記錄每個Agent的資訊
-                logger.info(f"Agent詳情 - 名稱: {agent_name}, 角色: {agent_role}, ID: {agent_id}, 建立時間: {agent_created_at}, 狀態: {agent_status}")
-                logger.info(f"新增Agent選項: {option}")
+            _agent_option_ids.clear()
+            _agent_option_ids.update(
+                (option, str(agent.get('id', '未知'))) for option, agent in zip(agent_options, agents_list)
+            )
+            _agent_choices_cache.update(options=agent_options, fetched_at=time.monotonic())
+
+            # 逐筆明細僅在 DEBUG 層級記錄，避免每次重新整理都格式化大量日誌
+            if logger.isEnabledFor(logging.DEBUG):
+                for agent, option in zip(agents_list, agent_options):
+                    logger.debug(f"Agent詳情 - 名稱: {agent.get('name', '未知')}, 角色: {agent.get('role', '未知')}, ID: {agent.get('id', '未知')}, 建立時間: {agent.get('created_at', '未知')}, 狀態: {agent.get('status', '未知')}")
+                    logger.debug(f"新增Agent選項: {option}")
 
             logger.info(f"總共取得 {len(agent_options)} 個Agent選項")
             logger.info("=== Agent列表取得完成 ===")
@@ -1211,28 +1662,33 @@ def load_agent_to_form(agent_display_str: str) -> tuple:
         if not agent_display_str or " - ID: " not in agent_display_str:
             return ("", "", "analyst", "", "專業,客觀,深入", "宏觀經濟,貨幣政策,財政政策", "請選擇一位Agent進行編輯", gr.update(interactive=True))
 
-        agent_id = agent_display_str.split(" - ID: ")[-1]
+        agent_id = _agent_id_from_option(agent_display_str)
 
-        # 呼叫API取得Agent詳細資訊
-        logger.info(f"--- 開始操作：載入 Agent 進行編輯 ---")
-        url = f"{base_url}/agents/{agent_id}"
-        logger.info(f"即將呼叫 GET: {url}")
-        response = make_api_request('GET', url)
-        if response.status_code == 200:
-            agent_data = safe_json_parse(response)
+        # 優先使用列表重新整理時取得的完整資料，快取未命中才呼叫API取得Agent詳細資訊
+        agent_data = _agent_full_cache.get(agent_id)
+        if agent_data is None:
+            logger.info(f"--- 開始操作：載入 Agent 進行編輯 ---")
+            url = f"{base_url}/agents/{agent_id}"
+            logger.info(f"即將呼叫 GET: {url}")
+            response = make_api_request('GET', url)
+            if response.status_code == 200:
+                agent_data = safe_json_parse(response)
+            else:
+                error_msg = f"❌ 取得Agent詳細資訊失敗: {handle_api_error(response, '取得Agent詳細資訊')}"
+                return ("", "", "analyst", "", "專業,客觀,深入", "宏觀經濟,貨幣政策,財政政策", error_msg, gr.update(interactive=True))
 
-            # 提取Agent資訊
-            name = agent_data.get("name", "")
-            role = agent_data.get("role", "")
-            system_prompt = agent_data.get("system_prompt", "")
-            personality_traits = agent_data.get("personality_traits", [])
-            expertise_areas = agent_data.get("expertise_areas", [])
+        # 提取Agent資訊
+        name = agent_data.get("name", "")
+        role = agent_data.get("role", "")
+        system_prompt = agent_data.get("system_prompt", "")
+        personality_traits = agent_data.get("personality_traits", [])
+        expertise_areas = agent_data.get("expertise_areas", [])
 
-            # 轉換為字串格式
-            traits_str = ", ".join(personality_traits) if isinstance(personality_traits, list) else str(personality_traits)
-            expertise_str = ", ".join(expertise_areas) if isinstance(expertise_areas, list) else str(expertise_areas)
+        # 轉換為字串格式
+        traits_str = ", ".join(personality_traits) if isinstance(personality_traits, list) else str(personality_traits)
+        expertise_str = ", ".join(expertise_areas) if isinstance(expertise_areas, list) else str(expertise_areas)
 
-            success_msg = f"""✅ 成功載入Agent進行編輯
+        success_msg = f"""✅ 成功載入Agent進行編輯
 📋 詳細資訊：
 • ID: {agent_id}
 • 名稱: {name}
@@ -1240,20 +1696,17 @@ def load_agent_to_form(agent_display_str: str) -> tuple:
 
 請修改表單中的值，然後點擊"儲存 Agent"。"""
 
-            # 返回更新後的表單值和禁用刪除按鈕
-            return (
-                gr.update(value=agent_id),
-                gr.update(value=name, interactive=True),
-                gr.update(value=role, interactive=True),
-                gr.update(value=system_prompt, interactive=True),
-                gr.update(value=traits_str, interactive=True),
-                gr.update(value=expertise_str, interactive=True),
-                gr.update(value=success_msg),
-                gr.update(interactive=True)  # Make delete button interactive
-            )
-        else:
-            error_msg = f"❌ 取得Agent詳細資訊失敗: {handle_api_error(response, '取得Agent詳細資訊')}"
-            return ("", "", "analyst", "", "專業,客觀,深入", "宏觀經濟,貨幣政策,財政政策", error_msg, gr.update(interactive=True))
+        # 返回更新後的表單值和禁用刪除按鈕
+        return (
+            gr.update(value=agent_id),
+            gr.update(value=name, interactive=True),
+            gr.update(value=role, interactive=True),
+            gr.update(value=system_prompt, interactive=True),
+            gr.update(value=traits_str, interactive=True),
+            gr.update(value=expertise_str, interactive=True),
+            gr.update(value=success_msg),
+            gr.update(interactive=True)  # Make delete button interactive
+        )
 
     except Exception as e:
         return ("", "", "", "", "", "", f"❌ 載入Agent詳細資訊時出錯: {str(e)}", gr.update(interactive=True))
@@ -1271,20 +1724,29 @@ def clear_agent_form():
         gr.update(interactive=True)  # 重新啟用刪除按鈕
     )
 
+# 角色列表幾乎不變，快取一段時間以免每次渲染表單都呼叫API
+ROLES_CACHE_TTL = 60  # 秒
+_roles_cache: Dict[str, Any] = {"roles": None, "fetched_at": 0.0}
+
 def get_supported_roles_list() -> List[str]:
-    """取得支援的角色列表 - 直接API呼叫"""
+    """取得支援的角色列表 - 直接API呼叫，成功結果快取 ROLES_CACHE_TTL 秒"""
+    if _roles_cache["roles"] is not None and time.monotonic() - _roles_cache["fetched_at"] < ROLES_CACHE_TTL:
+        return _roles_cache["roles"]
+
     try:
         response = make_api_request('GET', f"{base_url}/agents/roles")
         if response.status_code == 200:
             data = safe_json_parse(response)
             # API可能返回列表或包含roles鍵的字典
             if isinstance(data, list):
-                return data
+                roles = data
             elif isinstance(data, dict):
                 roles = data.get("roles", [])
-                return roles if isinstance(roles, list) else []
+                roles = roles if isinstance(roles, list) else []
             else:
                 return []
+            _roles_cache.update(roles=roles, fetched_at=time.monotonic())
+            return roles
         else:
             logger.warning(f"取得角色列表失敗: {response.status_code}")
             return []
@@ -1297,6 +1759,27 @@ def load_initial_data():
     agents, count_text = refresh_agent_list_with_retry()
     return gr.update(choices=agents), gr.update(value=count_text)
 
+def _delete_agent(agent_str: str) -> Optional[str]:
+    """刪除單一Agent，成功返回 None，失敗返回失敗描述"""
+    # 從格式 "名稱 (角色) - ID: xxx" 中提取ID
+    if " - ID: " not in agent_str:
+        logger.error(f"無法解析Agent ID: {agent_str}")
+        return f"{agent_str} (無法解析ID)"
+
+    agent_id = _agent_id_from_option(agent_str)
+    try:
+        url = f"{base_url}/agents/{agent_id}"
+        logger.info(f"即將呼叫 DELETE: {url}")
+        response = make_api_request('DELETE', url)
+        if response.status_code == 200:
+            logger.info(f"成功刪除Agent: {agent_id}")
+            return None
+        logger.error(f"刪除Agent失敗: {agent_id}, HTTP {response.status_code}")
+        return f"{agent_str} (HTTP {response.status_code})"
+    except Exception as e:
+        logger.error(f"刪除Agent時出錯: {agent_id}, 錯誤: {e}")
+        return f"{agent_str} (錯誤: {str(e)})"
+
 def delete_selected_agents(selected_agents: List[str]) -> tuple:
     """刪除選定的Agent"""
     logger.info(f"--- 開始刪除操作，接收到的 selected_agents: {selected_agents} (型別: {type(selected_agents)}) ---")
@@ -1307,30 +1790,18 @@ def delete_selected_agents(selected_agents: List[str]) -> tuple:
     if isinstance(selected_agents, str):
         selected_agents = [selected_agents]
 
-    deleted_count = 0
-    failed_deletions = []
+    # 各Agent的刪除互不相依，並行送出，總延遲約為單次請求而非逐一累加
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_AGENT_REQUESTS, len(selected_agents))) as executor:
+        failures = list(executor.map(_delete_agent, selected_agents))
 
-    for agent_str in selected_agents:
-        # 從格式 "名稱 (角色) - ID: xxx" 中提取ID
-        if " - ID: " in agent_str:
-            agent_id = agent_str.split(" - ID: ")[-1]
-            try:
-                logger.info(f"--- 開始操作：刪除 Agent ---")
-                url = f"{base_url}/agents/{agent_id}"
-                logger.info(f"即將呼叫 DELETE: {url}")
-                response = make_api_request('DELETE', url)
-                if response.status_code == 200:
-                    deleted_count += 1
-                    logger.info(f"成功刪除Agent: {agent_id}")
-                else:
-                    failed_deletions.append(f"{agent_str} (HTTP {response.status_code})")
-                    logger.error(f"刪除Agent失敗: {agent_id}, HTTP {response.status_code}")
-            except Exception as e:
-                failed_deletions.append(f"{agent_str} (錯誤: {str(e)})")
-                logger.error(f"刪除Agent時出錯: {agent_id}, 錯誤: {e}")
-        else:
-            failed_deletions.append(f"{agent_str} (無法解析ID)")
-            logger.error(f"無法解析Agent ID: {agent_str}")
+    failed_deletions = [failure for failure in failures if failure]
+    deleted_count = len(failures) - len(failed_deletions)
+
+    # 已刪除的Agent不應再從快取中解析出名稱
+    if deleted_count:
+        _cached_agent_details.cache_clear()
+        _clear_history_render_cache()
+        _agent_full_cache.clear()
 
     # 使用帶重試機制的重新整理取得更新後的Agent列表
     updated_agents, count_text = refresh_agent_list_with_retry()
@@ -1422,17 +1893,29 @@ def get_history_display() -> str:
                 history = []
             
             # 使用已有的format_debate_history函式格式化顯示
-            return format_debate_history(history)
+            return format_debate_history(history, session_id=current_session_id)
         return "❌ 無法取得辯論歷史"
     except Exception as e:
         return f"❌ 取得歷史時出錯: {str(e)}"
 
 def refresh_agents_list_action():
     logger.info("=== 使用者觸發Agent列表重新整理 ===")
+    _cached_agent_details.cache_clear()
+    _clear_history_render_cache()
     new_choices, count_text = refresh_agent_list_with_retry()
     logger.info(f"重新整理完成，取得 {len(new_choices)} 個Agent選項")
     return gr.update(choices=new_choices, value=[]), gr.update(value=count_text)
 
+# UI 事件處理函式都是阻塞式的 API 呼叫，由 Gradio 的工作執行緒池執行；
+# 辯論進度串流會在整場辯論期間佔用一個執行緒，因此不限制其並行數並加大執行緒池，
+# 一般事件使用 UI_DEFAULT_CONCURRENCY，避免 Gradio 4 預設的每事件並行數 1 讓多位使用者彼此排隊；
+# 啟動辯論會設定多個Agent並觸發LLM呼叫，另外限流以保護後端
+UI_MAX_THREADS = 100
+UI_DEFAULT_CONCURRENCY = 8
+UI_QUEUE_MAX_SIZE = 64
+START_DEBATE_CONCURRENCY = 2
+CANCEL_DEBATE_CONCURRENCY = 4
+
 # 建立Gradio介面
 with gr.Blocks(title="AgentScope 金融分析師辯論系統") as demo:
     gr.Markdown("""
@@ -1605,14 +2088,16 @@ with gr.Blocks(title="AgentScope 金融分析師辯論系統") as demo:
                         interactive=True,
                         info="選擇至少兩位 Agent 參與辯論。"
                     )
+                    # 上一次用於過濾辯論團隊選項的主席
+                    last_moderator_state = gr.State(None)
 
                     with gr.Row():
                         start_debate_btn = gr.Button("🚀 啟動辯論", variant="primary")
                         cancel_debate_btn = gr.Button("❌ 取消辯論", variant="secondary", visible=False)
                     debate_status_text = gr.Textbox(label="辯論狀態", interactive=False, lines=3)
             debate_setup_tab.select(
-                fn=lambda: (gr.update(choices=get_agents_for_selection()), gr.update(choices=get_agents_for_selection())),
-                outputs=[moderator_selector, debate_team_selector]
+                fn=refresh_agent_choices,
+                outputs=[moderator_selector, debate_team_selector, last_moderator_state]
             )
 
         with gr.TabItem("📊 辯論進度") as debate_progress_tab:
@@ -1640,6 +2125,7 @@ with gr.Blocks(title="AgentScope 金融分析師辯論系統") as demo:
                         max_lines=40
                     )
             history_state = gr.State([])
+            debate_session_state = gr.State(None)
 
     # 事件處理
     # ... (其他事件)
@@ -1650,113 +2136,57 @@ with gr.Blocks(title="AgentScope 金融分析師辯論系統") as demo:
     )
 
     # 辯論設定標籤頁的事件
+    # 啟動成功後接著串流進度：伺服器推送變更時才更新畫面，不再定時輪詢
     start_debate_btn.click(
         fn=start_debate_async,
         inputs=[topic_input, rounds_input, moderator_selector, moderator_prompt_input, debate_team_selector],
-        outputs=[debate_status_text, start_debate_btn, cancel_debate_btn, tabs, debate_progress_display, full_history_display]
-    )
-
-    demo.load(
-        fn=None,
-        inputs=None,
-        outputs=None,
-        every=5,
-        js="""
-        function() {
-            const tabButtons = document.querySelectorAll('.tabs > .tab-nav > button');
-            if (tabButtons.length > 2 && tabButtons[2].innerText === '📊 辯論進度') {
-                const progressTab = tabButtons[2];
-                if (progressTab.classList.contains('selected')) {
-                    const refreshButton = document.querySelector('#refresh_debate_progress');
-                    if (refreshButton) {
-                        // 檢查是否應該停止刷新
-                        const stopRefreshElement = document.querySelector('#stop_refresh_flag');
-                        if (stopRefreshElement && stopRefreshElement.value === 'true') {
-                            // 如果停止刷新標誌為真，則不點擊刷新按鈕
-                            return;
-                        }
-                        refreshButton.click();
-                    }
-                }
-            }
-        }
-        """
-    )
-
-    refresh_button = gr.Button("Refresh", elem_id="refresh_debate_progress", visible=False)
-
-    stop_refresh_flag = gr.Textbox(elem_id="stop_refresh_flag", visible=False, value="false")
-
-    def auto_refresh_progress(history_state: list) -> tuple:
-        progress, history = get_debate_progress(history_state)
-        full_history_text = format_debate_history(history)
-
-        # 獲取辯論狀態 (從 progress 字串中解析)
-        current_status = "unknown"
-        if "狀態: running" in progress:
-            current_status = "running"
-        elif "狀態: completed" in progress:
-            current_status = "completed"
-        elif "狀態: failed" in progress:
-            current_status = "failed"
-        elif "狀態: paused" in progress:
-            current_status = "paused"
-
-        # 預設按鈕狀態
-        start_btn_update = gr.update(interactive=False)
-        cancel_btn_update = gr.update(visible=True)
-        stop_flag = "false"
-
-        # 如果辯論已完成或失敗，則停止更新並調整按鈕狀態
-        if current_status in ["completed", "failed"]:
-            results = get_debate_results() # 確保在完成或失敗時獲取最終結果
-            start_btn_update = gr.update(interactive=True) # 啟用啟動辯論按鈕
-            cancel_btn_update = gr.update(visible=False) # 禁用取消辯論按鈕
-            stop_flag = "true" # 設定停止刷新標誌
-            # 返回所有更新，並停止自動刷新
-            return progress, results, full_history_text, history, start_btn_update, cancel_btn_update, stop_flag
-
-        # 辯論進行中，只更新進度，保持按鈕狀態
-        return progress, gr.update(), full_history_text, history, start_btn_update, cancel_btn_update, stop_flag
-
-    refresh_button.click(
-        fn=auto_refresh_progress,
-        inputs=[history_state],
-        outputs=[debate_progress_display, debate_result_display, full_history_display, history_state, start_debate_btn, cancel_debate_btn, stop_refresh_flag]
+        outputs=[debate_status_text, start_debate_btn, cancel_debate_btn, tabs, debate_progress_display, full_history_display, debate_session_state],
+        concurrency_limit=START_DEBATE_CONCURRENCY
+    ).then(
+        fn=stream_debate_progress,
+        inputs=[debate_session_state],
+        outputs=[debate_progress_display, debate_result_display, full_history_display, history_state, start_debate_btn, cancel_debate_btn],
+        concurrency_limit=None
     )
 
     cancel_debate_btn.click(
         fn=lambda: (
             "✅ 辯論已取消" if debate_manager.cancel_debate(current_session_id) else "❌ 取消辯論失敗",
-            gr.update(interactive=True),
-            gr.update(visible=False)
+            _BUTTON_ENABLE,
+            _BUTTON_HIDE
         ),
-        outputs=[debate_status_text, start_debate_btn, cancel_debate_btn]
+        outputs=[debate_status_text, start_debate_btn, cancel_debate_btn],
+        concurrency_limit=CANCEL_DEBATE_CONCURRENCY
     )
 
     # 將 refresh_agents_btn 的點擊事件擴展到辯論設定頁籤的元件
     refresh_agents_btn.click(
-        fn=lambda: (gr.update(choices=get_agents_for_selection()), gr.update(choices=get_agents_for_selection())),
+        fn=refresh_agent_choices,
         inputs=None,
-        outputs=[moderator_selector, debate_team_selector]
+        outputs=[moderator_selector, debate_team_selector, last_moderator_state]
     )
 
-    def update_debate_team_choices(moderator_selection):
-        """當主席被選中時，從辯論團隊中移除該人選"""
-        all_agents = get_agents_for_selection()
+    def update_debate_team_choices(moderator_selection, last_moderator):
+        """當主席被選中時，從辯論團隊中移除該人選；主席未變時不重新取得Agent列表"""
+        if moderator_selection and moderator_selection == last_moderator:
+            return _NO_UPDATE, last_moderator
+
+        all_agents = get_cached_agent_choices()
         if moderator_selection:
             # 過濾掉被選為主席的 agent
             available_debaters = [agent for agent in all_agents if agent != moderator_selection]
-            return gr.update(choices=available_debaters)
+            return gr.update(choices=available_debaters), moderator_selection
         # 如果沒有選擇主席，則顯示所有 agent
-        return gr.update(choices=all_agents)
+        return gr.update(choices=all_agents), None
 
     moderator_selector.change(
         fn=update_debate_team_choices,
-        inputs=moderator_selector,
-        outputs=debate_team_selector
+        inputs=[moderator_selector, last_moderator_state],
+        outputs=[debate_team_selector, last_moderator_state]
     )
 
 
+demo.queue(default_concurrency_limit=UI_DEFAULT_CONCURRENCY, max_size=UI_QUEUE_MAX_SIZE)
+
 if __name__ == "__main__":
-    demo.launch(server_name="0.0.0.0")
+    demo.launch(server_name="0.0.0.0", max_threads=UI_MAX_THREADS)
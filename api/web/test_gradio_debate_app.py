@@ -2,11 +2,16 @@ import unittest
 from unittest.mock import patch, MagicMock
 import json
 import gradio as gr
+import requests
+import threading
 import os # 導入 os 模組
+import gradio_debate_app
 from gradio_debate_app import (
     make_api_request, safe_json_parse, handle_api_error,
-    start_debate_async, get_debate_progress, format_debate_history,
-    auto_refresh_progress, DebateManager, current_session_id, selected_debate_agents,
+    start_debate_async, get_debate_progress, get_debate_results, format_debate_history,
+    stream_debate_progress, iter_debate_events, DebateManager, current_session_id, selected_debate_agents,
+    _cached_agent_details, _history_render_cache, _agent_full_cache, load_agent_to_form,
+    _debate_result_cache, _etag_cache,
     API_BASE_URL, DEFAULT_MODEL_NAME
 )
 
@@ -26,29 +31,87 @@ class TestGradioDebateApp(unittest.TestCase):
         self.mock_debate_manager.get_agent_details.return_value = {"name": "測試分析師", "role": "analyst", "id": "test-agent-id"}
         # 將模擬的 DebateManager 實例賦值給模組中的全域變數
         globals()['debate_manager'] = self.mock_debate_manager
-
-    @patch('requests.get')
-    def test_make_api_request_get_success(self, mock_get):
+        # 清空Agent詳細資訊快取，避免測試之間互相影響
+        _cached_agent_details.cache_clear()
+        _history_render_cache.clear()
+        _agent_full_cache.clear()
+        _debate_result_cache.clear()
+        _etag_cache.clear()
+
+    @patch('gradio_debate_app._http_session.request')
+    def test_make_api_request_get_success(self, mock_request):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.ok = True
-        mock_get.return_value = mock_response
+        mock_request.return_value = mock_response
         
         response = make_api_request('GET', 'http://test.com/api')
         self.assertEqual(response.status_code, 200)
-        mock_get.assert_called_once_with('http://test.com/api', timeout=10)
+        mock_request.assert_called_once_with('GET', 'http://test.com/api', timeout=10)
 
-    @patch('requests.post')
-    def test_make_api_request_post_failure(self, mock_post):
+    @patch('gradio_debate_app._http_session.request')
+    def test_make_api_request_post_failure(self, mock_request):
         mock_response = MagicMock()
         mock_response.status_code = 400
         mock_response.ok = False
         mock_response.text = "Bad Request"
-        mock_post.return_value = mock_response
+        mock_request.return_value = mock_response
         
         response = make_api_request('POST', 'http://test.com/api', json={"key": "value"})
         self.assertEqual(response.status_code, 400)
-        mock_post.assert_called_once()
+        mock_request.assert_called_once()
+
+    @staticmethod
+    def _json_response(status_code, body=None, etag=None):
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers["Content-Type"] = "application/json"
+        if etag:
+            response.headers["ETag"] = etag
+        response._content = b"" if body is None else json.dumps(body).encode("utf-8")
+        return response
+
+    @patch('gradio_debate_app._http_session.request')
+    def test_make_api_request_not_modified_returns_cached_json(self, mock_request):
+        mock_request.side_effect = [
+            self._json_response(200, {"status": "running"}, etag='W/"v1"'),
+            self._json_response(304, etag='W/"v1"')
+        ]
+
+        make_api_request('GET', 'http://test.com/api')
+        self.assertEqual(_etag_cache['http://test.com/api'], ('W/"v1"', b'{"status": "running"}'))
+        response = make_api_request('GET', 'http://test.com/api')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'{"status": "running"}')
+        self.assertEqual(response.json(), {"status": "running"})
+        self.assertEqual(mock_request.call_args.kwargs["headers"], {"If-None-Match": 'W/"v1"'})
+
+    @patch('gradio_debate_app._http_session.request')
+    def test_make_api_request_etag_cache_keyed_by_params(self, mock_request):
+        mock_request.side_effect = [
+            self._json_response(200, [1], etag='W/"a"'),
+            self._json_response(200, [2], etag='W/"b"')
+        ]
+
+        make_api_request('GET', 'http://test.com/api', params={"page": 1})
+        response = make_api_request('GET', 'http://test.com/api', params={"page": 2})
+
+        self.assertNotIn("headers", mock_request.call_args.kwargs)
+        self.assertEqual(response.json(), [2])
+        self.assertEqual(len(_etag_cache), 2)
+
+    @patch('gradio_debate_app.ETAG_CACHE_MAX_ENTRIES', 2)
+    @patch('gradio_debate_app._http_session.request')
+    def test_make_api_request_etag_cache_is_bounded(self, mock_request):
+        mock_request.side_effect = [
+            self._json_response(200, {}, etag=f'W/"{i}"') for i in range(3)
+        ]
+
+        for i in range(3):
+            make_api_request('GET', f'http://test.com/api/{i}')
+
+        self.assertEqual(list(_etag_cache), ['http://test.com/api/1', 'http://test.com/api/2'])
 
     def test_safe_json_parse_success(self):
         mock_response = MagicMock()
@@ -106,17 +169,97 @@ class TestGradioDebateApp(unittest.TestCase):
         mock_response_fail.status_code = 422
         mock_response_fail.json.return_value = {"detail": "Validation Error"}
 
-        mock_make_api_request.side_effect = [
-            mock_response_ok, # for moderator configure
-            mock_response_fail # for team agent configure
-        ]
+        # 設定請求並行送出，依 URL 決定回應：只有 agent1 的設定失敗
+        mock_make_api_request.side_effect = lambda method, url, **kwargs: (
+            mock_response_fail if "/agents/agent1-id/" in url else mock_response_ok
+        )
         
-        result = start_debate_async("Moderator (role) - ID: moderator-id", "topic", 3, "prompt", ["Agent1 (role) - ID: agent1-id", "Agent2 (role) - ID: agent2-id"])
-        self.assertIn("設定Agent agent1-id 失敗: HTTP 422", result[0])
+        result = start_debate_async("topic", 3, "Moderator (role) - ID: moderator-id", "prompt", ["Agent1 (role) - ID: agent1-id", "Agent2 (role) - ID: agent2-id"])
+        self.assertIn("設定Agent agent1-id 失敗", result[0])
+        self.assertIn("Validation Error", result[0])
         self.assertIsInstance(result[1], gr.update().__class__)
+        self.assertIsNone(result[-1])
+        # 設定失敗後不會啟動辯論
+        for call in mock_make_api_request.call_args_list:
+            self.assertNotIn("/debate/start", call.args[1])
+
+    @patch('gradio_debate_app.MAX_PARALLEL_AGENT_REQUESTS', 1)
+    @patch('gradio_debate_app.make_api_request')
+    def test_start_debate_async_configure_fail_cancels_pending(self, mock_make_api_request):
+        mock_response_ok = MagicMock()
+        mock_response_ok.status_code = 200
+        mock_response_fail = MagicMock()
+        mock_response_fail.status_code = 422
+        mock_response_fail.json.return_value = {"detail": "Validation Error"}
+
+        # 只有一個工作執行緒：第二個設定請求最多送出後停住，第三個仍在佇列中，失敗後應被取消
+        second_call_release = threading.Event()
+        def configure(method, url, **kwargs):
+            if "/agents/moderator-id/" in url:
+                return mock_response_fail
+            second_call_release.wait(5)
+            return mock_response_ok
+        mock_make_api_request.side_effect = configure
+
+        result = start_debate_async("topic", 3, "Moderator (role) - ID: moderator-id", "prompt", ["Agent1 (role) - ID: agent1-id", "Agent2 (role) - ID: agent2-id"])
+        second_call_release.set()
+
+        self.assertIn("設定Agent moderator-id 失敗", result[0])
+        configured_urls = [call.args[1] for call in mock_make_api_request.call_args_list]
+        self.assertFalse(any("/agents/agent2-id/" in url for url in configured_urls))
 
     @patch('gradio_debate_app.make_api_request')
-    def test_start_debate_async_success(self, mock_make_api_request):
+    def test_start_debate_async_configure_fail_reports_in_agent_order(self, mock_make_api_request):
+        mock_response_ok = MagicMock()
+        mock_response_ok.status_code = 200
+        mock_response_fail = MagicMock()
+        mock_response_fail.status_code = 422
+        mock_response_fail.json.return_value = {"detail": "Validation Error"}
+
+        # agent2 先失敗，主席較晚失敗：仍依主席、團隊成員的順序回報主席
+        agent2_failed = threading.Event()
+        def configure(method, url, **kwargs):
+            if "/agents/agent2-id/" in url:
+                agent2_failed.set()
+                return mock_response_fail
+            if "/agents/moderator-id/" in url:
+                agent2_failed.wait(5)
+                return mock_response_fail
+            return mock_response_ok
+        mock_make_api_request.side_effect = configure
+
+        result = start_debate_async("topic", 3, "Moderator (role) - ID: moderator-id", "prompt", ["Agent1 (role) - ID: agent1-id", "Agent2 (role) - ID: agent2-id"])
+
+        self.assertIn("設定Agent moderator-id 失敗", result[0])
+
+    @patch('gradio_debate_app.make_api_request')
+    def test_start_debate_async_configure_request_error(self, mock_make_api_request):
+        mock_response_ok = MagicMock()
+        mock_response_ok.status_code = 200
+        def configure(method, url, **kwargs):
+            if "/agents/agent1-id/" in url:
+                raise requests.ConnectionError("connection refused")
+            return mock_response_ok
+        mock_make_api_request.side_effect = configure
+
+        result = start_debate_async("topic", 3, "Moderator (role) - ID: moderator-id", "prompt", ["Agent1 (role) - ID: agent1-id", "Agent2 (role) - ID: agent2-id"])
+
+        self.assertEqual(result[0], "❌ 設定Agent agent1-id 失敗: connection refused")
+        self.assertIsNone(result[-1])
+
+    @patch('gradio_debate_app._prefetch_debate_agent_details')
+    @patch('gradio_debate_app.make_api_request')
+    def test_start_debate_async_success(self, mock_make_api_request, mock_prefetch):
+        # 預先載入在背景執行，啟動辯論不等待它完成
+        prefetch_started = threading.Event()
+        prefetch_release = threading.Event()
+        prefetch_finished = threading.Event()
+        def prefetch(agent_ids):
+            prefetch_started.set()
+            prefetch_release.wait(5)
+            prefetch_finished.set()
+        mock_prefetch.side_effect = prefetch
+
         mock_response_configure = MagicMock()
         mock_response_configure.status_code = 200
         mock_response_configure.json.return_value = {} # configure doesn't return agent_id
@@ -132,12 +275,16 @@ class TestGradioDebateApp(unittest.TestCase):
             mock_response_start # start debate
         ]
 
-        result = start_debate_async("Moderator (role) - ID: moderator-id", "topic", 3, "prompt", ["Agent1 (role) - ID: agent1-id", "Agent2 (role) - ID: agent2-id"])
+        result = start_debate_async("topic", 3, "Moderator (role) - ID: moderator-id", "prompt", ["Agent1 (role) - ID: agent1-id", "Agent2 (role) - ID: agent2-id"])
         self.assertIn("辯論啟動成功！會話ID: test-session-id", result[0])
         self.assertIsInstance(result[1], gr.update().__class__) # interactive=False
         self.assertIsInstance(result[2], gr.update().__class__) # visible=True
         self.assertIsInstance(result[3], gr.update().__class__) # selected="📊 辯論進度"
         self.assertEqual(globals()['current_session_id'], "test-session-id")
+        self.assertFalse(prefetch_finished.is_set())
+        self.assertTrue(prefetch_started.wait(5))
+        prefetch_release.set()
+        mock_prefetch.assert_called_once_with(["moderator-id", "agent1-id", "agent2-id"])
 
     @patch('gradio_debate_app.make_api_request')
     def test_get_debate_progress_no_session(self, mock_make_api_request):
@@ -227,40 +374,234 @@ class TestGradioDebateApp(unittest.TestCase):
         self.assertIn("👤 agent1-id (analyst):", result)
         mock_get_agent_details.assert_called_once_with("agent1-id")
 
-    @patch('gradio_debate_app.get_debate_progress')
-    @patch('gradio_debate_app.format_debate_history')
-    @patch('gradio_debate_app.get_debate_results')
-    def test_auto_refresh_progress_running(self, mock_get_debate_results, mock_format_debate_history, mock_get_debate_progress):
-        mock_get_debate_progress.return_value = ("狀態: running\n...", [{"status": "running"}])
-        mock_format_debate_history.return_value = "完整歷史紀錄"
-        
-        progress, results, full_history, history_state, start_btn, cancel_btn, stop_flag = auto_refresh_progress([])
-        
-        self.assertIn("狀態: running", progress)
-        self.assertIsInstance(results, gr.update().__class__) # 應該是 gr.update()
-        self.assertEqual(full_history, "完整歷史紀錄")
-        self.assertEqual(history_state, [{"status": "running"}])
-        self.assertIsInstance(start_btn, gr.update().__class__) # interactive=False
-        self.assertIsInstance(cancel_btn, gr.update().__class__) # visible=True
-        self.assertEqual(stop_flag, "false")
-
-    @patch('gradio_debate_app.get_debate_progress')
-    @patch('gradio_debate_app.format_debate_history')
+    @patch('gradio_debate_app.selected_debate_agents', ["宏觀經濟分析師 (analyst) - ID: agent1-id"])
+    @patch('gradio_debate_app.DebateManager.get_agent_details')
+    def test_format_debate_history_uses_selected_agent_names(self, mock_get_agent_details):
+        history_data = [
+            {"agent_id": "agent1-id", "agent_name": "", "agent_role": "analyst", "content": "發言內容", "round": 1}
+        ]
+        result = format_debate_history(history_data)
+        self.assertIn("👤 宏觀經濟分析師 (analyst):", result)
+        mock_get_agent_details.assert_not_called()
+
+    @patch('gradio_debate_app.DebateManager.get_agent_details')
+    def test_format_debate_history_uses_agent_list_details(self, mock_get_agent_details):
+        _agent_full_cache["agent1-id"] = {"id": "agent1-id", "name": "列表中的分析師", "role": "analyst"}
+        history_data = [
+            {"agent_id": "agent1-id", "agent_name": "", "agent_role": "analyst", "content": "發言內容", "round": 1}
+        ]
+        result = format_debate_history(history_data)
+        self.assertIn("👤 列表中的分析師 (analyst):", result)
+        mock_get_agent_details.assert_not_called()
+
+    @patch('gradio_debate_app.DebateManager.get_agent_details')
+    def test_format_debate_history_hyphenated_name_not_queried(self, mock_get_agent_details):
+        history_data = [
+            {"agent_name": "Jean-Luc", "agent_role": "critic", "content": "發言內容", "round": 1}
+        ]
+        result = format_debate_history(history_data)
+        self.assertIn("👤 Jean-Luc (critic):", result)
+        mock_get_agent_details.assert_not_called()
+
+    @patch('gradio_debate_app.DebateManager.get_agent_details')
+    def test_prefetch_debate_agent_details_fills_cache(self, mock_get_agent_details):
+        mock_get_agent_details.side_effect = lambda agent_id: {"id": agent_id, "name": f"Agent {agent_id}", "role": "analyst"}
+        gradio_debate_app._prefetch_debate_agent_details(["mod-id", "agent1-id"])
+        self.assertEqual(mock_get_agent_details.call_count, 2)
+
+        history_data = [
+            {"agent_id": "agent1-id", "agent_name": "", "agent_role": "analyst", "content": "發言內容", "round": 1}
+        ]
+        result = format_debate_history(history_data)
+        self.assertIn("👤 Agent agent1-id (analyst):", result)
+        self.assertEqual(mock_get_agent_details.call_count, 2)
+
+    @patch('gradio_debate_app._format_history_round', wraps=gradio_debate_app._format_history_round)
+    def test_format_debate_history_reuses_completed_rounds(self, mock_format_history_round):
+        history_data = [
+            {"agent_name": "分析師A", "agent_role": "analyst", "content": "第一輪發言", "round": 1},
+            {"agent_name": "分析師B", "agent_role": "critic", "content": "第二輪發言", "round": 2}
+        ]
+        format_debate_history(history_data, session_id="test-session-id")
+        mock_format_history_round.reset_mock()
+
+        history_data.append({"agent_name": "分析師A", "agent_role": "analyst", "content": "第三輪發言", "round": 3})
+        result = format_debate_history(history_data, session_id="test-session-id")
+
+        # 第1輪已快取，只重新格式化第2輪（先前的最新輪）與新增的第3輪
+        self.assertEqual([c.args[0] for c in mock_format_history_round.call_args_list], [2, 3])
+        self.assertEqual(result, format_debate_history(history_data))
+
+    def test_format_debate_history_renders_only_new_tail(self):
+        history_data = [
+            {"agent_name": f"分析師{i}", "agent_role": "analyst", "content": f"發言{i}", "round": i // 10 + 1}
+            for i in range(200)
+        ]
+        format_debate_history(history_data, session_id="test-session-id")
+
+        history_data = history_data + [{"agent_name": "分析師X", "agent_role": "critic", "content": "新發言", "round": 21}]
+        with patch('gradio_debate_app._history_round', wraps=gradio_debate_app._history_round) as mock_history_round:
+            result = format_debate_history(history_data, session_id="test-session-id")
+
+        # 只檢查與排序上次的最新一輪（10條）和新增的1條，不走訪整份歷史（201條）
+        self.assertLessEqual(mock_history_round.call_count, 4 * 11)
+        self.assertEqual(result, format_debate_history(history_data))
+
+    def test_format_debate_history_sessions_keep_their_own_cache(self):
+        history_a = [
+            {"agent_name": "分析師A", "agent_role": "analyst", "content": "A第一輪", "round": 1},
+            {"agent_name": "分析師A", "agent_role": "analyst", "content": "A第二輪", "round": 2}
+        ]
+        history_b = [
+            {"agent_name": "分析師B", "agent_role": "critic", "content": "B第一輪", "round": 1},
+            {"agent_name": "分析師B", "agent_role": "critic", "content": "B第二輪", "round": 2}
+        ]
+        format_debate_history(history_a, session_id="session-a")
+        format_debate_history(history_b, session_id="session-b")
+
+        # 另一個會話的渲染不會淘汰此會話已快取的輪次
+        with patch('gradio_debate_app._format_history_round', wraps=gradio_debate_app._format_history_round) as mock_format_history_round:
+            format_debate_history(history_a, session_id="session-a")
+        self.assertEqual([c.args[0] for c in mock_format_history_round.call_args_list], [2])
+        self.assertEqual(list(_history_render_cache), ["session-b", "session-a"])
+
+    @patch('gradio_debate_app.HISTORY_RENDER_CACHE_MAX_ENTRIES', 2)
+    def test_format_debate_history_cache_is_bounded(self):
+        history_data = [
+            {"agent_name": "分析師A", "agent_role": "analyst", "content": "第一輪發言", "round": 1},
+            {"agent_name": "分析師B", "agent_role": "critic", "content": "第二輪發言", "round": 2}
+        ]
+        for session_id in ("session-1", "session-2", "session-3"):
+            format_debate_history(history_data, session_id=session_id)
+
+        self.assertEqual(list(_history_render_cache), ["session-2", "session-3"])
+
+    def test_format_debate_history_rewritten_history_renders_again(self):
+        history_data = [
+            {"agent_name": "分析師A", "agent_role": "analyst", "content": "第一輪發言", "round": 1},
+            {"agent_name": "分析師B", "agent_role": "critic", "content": "第二輪發言", "round": 2}
+        ]
+        format_debate_history(history_data, session_id="test-session-id")
+
+        rewritten = [dict(history_data[0], content="改寫的發言"), history_data[1]]
+        result = format_debate_history(rewritten, session_id="test-session-id")
+
+        self.assertIn("改寫的發言", result)
+        self.assertNotIn("第一輪發言", result)
+
+    @patch('gradio_debate_app.make_api_request')
+    def test_load_agent_to_form_uses_cached_agent(self, mock_make_api_request):
+        _agent_full_cache["agent1-id"] = {
+            "id": "agent1-id", "name": "快取分析師", "role": "analyst", "system_prompt": "你是一位分析師",
+            "personality_traits": ["專業"], "expertise_areas": ["宏觀經濟"]
+        }
+        result = load_agent_to_form("快取分析師 (analyst) - ID: agent1-id")
+        self.assertEqual(result[1]["value"], "快取分析師")
+        self.assertEqual(result[4]["value"], "專業")
+        mock_make_api_request.assert_not_called()
+
+    @patch('gradio_debate_app.current_session_id', "test-session-id")
+    @patch('gradio_debate_app.make_api_request')
+    def test_get_debate_results_fetches_finished_result_once(self, mock_make_api_request):
+        mock_result_response = MagicMock()
+        mock_result_response.status_code = 200
+        mock_result_response.json.return_value = {"final_conclusion": "最終結論"}
+        mock_make_api_request.return_value = mock_result_response
+
+        first = get_debate_results()
+        second = get_debate_results()
+
+        self.assertEqual(first, second)
+        self.assertIn("最終結論", first)
+        mock_make_api_request.assert_called_once()
+
+    @patch('gradio_debate_app.DEBATE_RESULT_CACHE_MAX_ENTRIES', 2)
+    @patch('gradio_debate_app.make_api_request')
+    def test_debate_result_cache_is_bounded(self, mock_make_api_request):
+        mock_result_response = MagicMock()
+        mock_result_response.status_code = 200
+        mock_result_response.json.return_value = {"final_conclusion": "最終結論"}
+        mock_make_api_request.return_value = mock_result_response
+
+        for session_id in ("s1", "s2", "s1", "s3"):
+            gradio_debate_app._fetch_debate_result(session_id)
+
+        # s1 最近被使用過，淘汰最久未用的 s2
+        self.assertEqual(list(_debate_result_cache), ["s1", "s3"])
+        self.assertEqual(mock_make_api_request.call_count, 3)
+
+    @patch('gradio_debate_app.iter_debate_events')
+    def test_stream_debate_progress_without_session(self, mock_iter_debate_events):
+        self.assertEqual(list(stream_debate_progress(None)), [])
+        mock_iter_debate_events.assert_not_called()
+
+    @patch('gradio_debate_app.iter_debate_events')
     @patch('gradio_debate_app.get_debate_results')
-    def test_auto_refresh_progress_completed(self, mock_get_debate_results, mock_format_debate_history, mock_get_debate_progress):
-        mock_get_debate_progress.return_value = ("狀態: completed\n...", [{"status": "completed"}])
-        mock_format_debate_history.return_value = "完整歷史紀錄"
+    @patch('gradio_debate_app._fetch_final_conclusion')
+    def test_stream_debate_progress_until_completed(self, mock_fetch_final_conclusion, mock_get_debate_results, mock_iter_debate_events):
+        entry = {"agent_name": "Agent1", "agent_role": "analyst", "content": "發言1", "round": 1}
+        mock_iter_debate_events.return_value = iter([
+            {"status": "running", "current_round": 1, "total_rounds": 1, "progress": 50, "history": [entry]},
+            {"status": "completed", "current_round": 1, "total_rounds": 1, "progress": 100, "history": []}
+        ])
+        mock_fetch_final_conclusion.return_value = "最終結論"
         mock_get_debate_results.return_value = "最終辯論結果"
 
-        progress, results, full_history, history_state, start_btn, cancel_btn, stop_flag = auto_refresh_progress([])
+        updates = list(stream_debate_progress("test-session-id"))
+        self.assertEqual(len(updates), 2)
+
+        progress, results, full_history, history_state, start_btn, cancel_btn = updates[0]
+        self.assertIn("狀態: running", progress)
+        self.assertIn("第1輪 - Agent1: 發言1", progress)
+        self.assertIsInstance(results, gr.update().__class__) # 應該是 gr.update()
+        self.assertIn("👤 Agent1 (analyst):", full_history)
+        self.assertEqual(history_state, [entry])
+        self.assertFalse(start_btn["interactive"])
+        self.assertTrue(cancel_btn["visible"])
 
+        progress, results, full_history, history_state, start_btn, cancel_btn = updates[1]
         self.assertIn("狀態: completed", progress)
+        self.assertIn("最終結論", progress)
         self.assertEqual(results, "最終辯論結果")
-        self.assertEqual(full_history, "完整歷史紀錄")
-        self.assertEqual(history_state, [{"status": "completed"}])
-        self.assertIsInstance(start_btn, gr.update().__class__) # interactive=True
-        self.assertIsInstance(cancel_btn, gr.update().__class__) # visible=False
-        self.assertEqual(stop_flag, "true")
+        self.assertIsInstance(full_history, gr.update().__class__) # 沒有新發言，不重送歷史
+        self.assertTrue(start_btn["interactive"])
+        self.assertFalse(cancel_btn["visible"])
+        mock_get_debate_results.assert_called_once_with("test-session-id")
+
+    @patch('gradio_debate_app._fetch_debate_result')
+    def test_get_debate_results_uses_given_session(self, mock_fetch_debate_result):
+        mock_fetch_debate_result.return_value = {"topic": "主題"}
+        with patch('gradio_debate_app.current_session_id', "other-session-id"):
+            get_debate_results("test-session-id")
+        mock_fetch_debate_result.assert_called_once_with("test-session-id")
+
+    @patch('gradio_debate_app.time.sleep')
+    @patch('gradio_debate_app.make_api_request')
+    def test_iter_debate_events_falls_back_to_polling_when_stream_drops(self, mock_make_api_request, mock_sleep):
+        mock_stream_response = MagicMock()
+        mock_stream_response.status_code = 200
+        def iter_lines(decode_unicode=False):
+            yield 'data: {"status": "running", "progress": 50, "history": []}'
+            yield ''
+            raise requests.ConnectionError("stream dropped")
+        mock_stream_response.iter_lines.side_effect = iter_lines
+
+        mock_status_response = MagicMock()
+        mock_status_response.status_code = 200
+        mock_status_response.json.return_value = {"status": "completed", "progress": 100}
+
+        mock_make_api_request.side_effect = [
+            mock_stream_response,
+            requests.ConnectionError("temporarily unavailable"),
+            mock_status_response
+        ]
+
+        events = list(iter_debate_events("test-session-id"))
+        self.assertEqual(events, [
+            {"status": "running", "progress": 50, "history": []},
+            {"status": "completed", "progress": 100}
+        ])
+        self.assertTrue(mock_make_api_request.call_args.args[1].endswith("/debate/test-session-id/status"))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
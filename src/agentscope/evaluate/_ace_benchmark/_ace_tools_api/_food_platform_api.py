@@ -1,115 +1,147 @@
 # -*- coding: utf-8 -*-
 """The food platform API in the ACEBench evaluation."""
 
-from ._shared_state import SharedState
+from ._shared_state import SharedState, requires_device_state
+
+
+# 用户和初始金额。余额会随下单变化，每个实例复制一份
+_USERS_SEED: dict[str, dict] = {
+    "Eve": {
+        "user_id": "U100",
+        "password": "password123",
+        "balance": 500.0,
+    },
+    "Frank": {
+        "user_id": "U101",
+        "password": "password456",
+        "balance": 300.0,
+    },
+    "Grace": {
+        "user_id": "U102",
+        "password": "password789",
+        "balance": 150.0,
+    },
+    "Helen": {
+        "user_id": "U103",
+        "password": "password321",
+        "balance": 800.0,
+    },
+    "Isaac": {
+        "user_id": "U104",
+        "password": "password654",
+        "balance": 400.0,
+    },
+    "Jack": {
+        "user_id": "U105",
+        "password": "password654",
+        "balance": 120.0,
+    },
+}
+
+# 六个商家及其菜单，运行中只读，所有实例共享
+_MERCHANT_LIST: dict[str, dict] = {
+    "达美乐": {
+        "merchant_id": "M100",
+        "service_type": "Pizza",
+        "menu": [
+            {"product": "玛格丽特披萨", "price": 68.0},
+            {"product": "超级至尊披萨", "price": 88.0},
+        ],
+    },
+    "米村拌饭": {
+        "merchant_id": "M101",
+        "service_type": "Bibimbap",
+        "menu": [
+            {"product": "石锅拌饭", "price": 35.0},
+            {"product": "韩式牛肉拌饭", "price": 45.0},
+        ],
+    },
+    "海底捞": {
+        "merchant_id": "M102",
+        "service_type": "Hotpot",
+        "menu": [
+            {"product": "牛肉卷", "price": 68.0},
+            {"product": "海鲜拼盘", "price": 88.0},
+        ],
+    },
+    "喜茶": {
+        "merchant_id": "M103",
+        "service_type": "Milk Tea",
+        "menu": [
+            {"product": "芝士奶茶", "price": 25.0},
+            {"product": "四季春奶茶", "price": 22.0},
+        ],
+    },
+    "盒马生鲜": {
+        "merchant_id": "M104",
+        "service_type": "Fresh Grocery",
+        "menu": [
+            {"product": "有机蔬菜包", "price": 15.0},
+            {"product": "生鲜大礼包", "price": 99.0},
+        ],
+    },
+    "九田家烤肉": {
+        "merchant_id": "M105",
+        "service_type": "BBQ",
+        "menu": [
+            {"product": "韩式烤牛肉", "price": 128.0},
+            {"product": "烤五花肉", "price": 78.0},
+        ],
+    },
+}
+
+# 商家 -> {商品名称: 单价}，下单时按名称直接查价，无需遍历菜单
+_MENU_INDEX: dict[str, dict[str, float]] = {
+    name: {item["product"]: item["price"] for item in merchant["menu"]}
+    for name, merchant in _MERCHANT_LIST.items()
+}
 
 
 class FoodPlatformApi(SharedState):
     """The food platform Api in the ACEBench evaluation."""
 
-    tool_functions: list[str] = [
-        "login_food_platform",
-        "view_logged_in_users",
-        "check_balance",
-        "add_food_delivery_order",
-        "get_products",
-        "view_orders",
-        "search_orders",
-    ]
+    __slots__ = (
+        "users",
+        "merchant_list",
+        "_menu_index",
+        "logged_in_users",
+        "_logged_in_user_set",
+        "orders",
+        "_orders_by_user",
+    )
+
+    tool_functions: frozenset[str] = frozenset(
+        {
+            "login_food_platform",
+            "view_logged_in_users",
+            "check_balance",
+            "add_food_delivery_order",
+            "get_products",
+            "view_orders",
+            "search_orders",
+        },
+    )
 
     def __init__(self, shared_state: dict) -> None:
         super().__init__(shared_state)
 
         # 设置用户和初始金额
         self.users: dict = {
-            "Eve": {
-                "user_id": "U100",
-                "password": "password123",
-                "balance": 500.0,
-            },
-            "Frank": {
-                "user_id": "U101",
-                "password": "password456",
-                "balance": 300.0,
-            },
-            "Grace": {
-                "user_id": "U102",
-                "password": "password789",
-                "balance": 150.0,
-            },
-            "Helen": {
-                "user_id": "U103",
-                "password": "password321",
-                "balance": 800.0,
-            },
-            "Isaac": {
-                "user_id": "U104",
-                "password": "password654",
-                "balance": 400.0,
-            },
-            "Jack": {
-                "user_id": "U105",
-                "password": "password654",
-                "balance": 120.0,
-            },
+            name: dict(info) for name, info in _USERS_SEED.items()
         }
 
         # 设置六个商家及其菜单
-        self.merchant_list: dict[str, dict] = {
-            "达美乐": {
-                "merchant_id": "M100",
-                "service_type": "Pizza",
-                "menu": [
-                    {"product": "玛格丽特披萨", "price": 68.0},
-                    {"product": "超级至尊披萨", "price": 88.0},
-                ],
-            },
-            "米村拌饭": {
-                "merchant_id": "M101",
-                "service_type": "Bibimbap",
-                "menu": [
-                    {"product": "石锅拌饭", "price": 35.0},
-                    {"product": "韩式牛肉拌饭", "price": 45.0},
-                ],
-            },
-            "海底捞": {
-                "merchant_id": "M102",
-                "service_type": "Hotpot",
-                "menu": [
-                    {"product": "牛肉卷", "price": 68.0},
-                    {"product": "海鲜拼盘", "price": 88.0},
-                ],
-            },
-            "喜茶": {
-                "merchant_id": "M103",
-                "service_type": "Milk Tea",
-                "menu": [
-                    {"product": "芝士奶茶", "price": 25.0},
-                    {"product": "四季春奶茶", "price": 22.0},
-                ],
-            },
-            "盒马生鲜": {
-                "merchant_id": "M104",
-                "service_type": "Fresh Grocery",
-                "menu": [
-                    {"product": "有机蔬菜包", "price": 15.0},
-                    {"product": "生鲜大礼包", "price": 99.0},
-                ],
-            },
-            "九田家烤肉": {
-                "merchant_id": "M105",
-                "service_type": "BBQ",
-                "menu": [
-                    {"product": "韩式烤牛肉", "price": 128.0},
-                    {"product": "烤五花肉", "price": 78.0},
-                ],
-            },
-        }
+        self.merchant_list: dict[str, dict] = _MERCHANT_LIST
+        self._menu_index: dict[str, dict[str, float]] = _MENU_INDEX
 
         # 设置已登录用户列表
         self.logged_in_users: list[str] = []
+        # 已登录用户集合，用于成员检查；列表保留登录顺序供状态导出
+        self._logged_in_user_set: set[str] = set()
         # 订单列表
         self.orders: list = []
+        # 用户名 -> 该用户的订单，与 orders 引用同一批订单字典
+        self._orders_by_user: dict[str, list[dict]] = {}
 
     def get_state_dict(self) -> dict:
         """Get the current state dict of the FoodPlatformApi."""
@@ -121,6 +153,9 @@ class FoodPlatformApi(SharedState):
             },
         }
 
+    @requires_device_state(
+        wifi_error="wifi未開啟，無法登錄",
+    )
     def login_food_platform(
         self,
         username: str,
@@ -134,19 +169,18 @@ class FoodPlatformApi(SharedState):
             password (`str`):
                 用戶的密碼。
         """
-        if not self.wifi:
-            return {"status": False, "message": "wifi未開啟，無法登錄"}
         if username not in self.users:
             return {"status": False, "message": "用戶不存在"}
         if self.users[username]["password"] != password:
             return {"status": False, "message": "密碼錯誤"}
 
         # 檢查是否已經有用戶登錄
-        if username in self.logged_in_users:
+        if username in self._logged_in_user_set:
             return {"status": False, "message": f"{username} 已經登錄"}
 
         # 記錄已登錄用戶
         self.logged_in_users.append(username)
+        self._logged_in_user_set.add(username)
         return {"status": True, "message": f"用戶{username}登陸成功！"}
 
     def view_logged_in_users(self) -> dict:
@@ -187,7 +221,7 @@ class FoodPlatformApi(SharedState):
             items (`list[dict[str, str | int]]`):
                 訂單中商品的列表，每個商品包含名稱和數量。
         """
-        if username not in self.logged_in_users:
+        if username not in self._logged_in_user_set:
             return {
                 "status": False,
                 "message": f"用戶 {username} 未登錄food platform",
@@ -196,9 +230,10 @@ class FoodPlatformApi(SharedState):
         if merchant_name not in self.merchant_list:
             return {"status": False, "message": "商家不存在"}
 
+        menu = self._menu_index[merchant_name]
         total_price = 0.0
         order_items = []
-        
+
         for item in items:
             product_name = item.get("product")
             quantity = item.get("quantity", 1)
@@ -210,26 +245,23 @@ class FoodPlatformApi(SharedState):
                 }
 
             # 查找商品價格
-            product_found = False
-            for product in self.merchant_list[merchant_name]["menu"]:
-                if product["product"] == product_name:
-                    total_price += product["price"] * quantity
-                    order_items.append(
-                        {
-                            "product": product_name,
-                            "quantity": quantity,
-                            "price_per_unit": product["price"],
-                        },
-                    )
-                    product_found = True
-                    break
-            if not product_found:
+            price = menu.get(product_name)
+            if price is None:
                 return {
                     "status": False,
                     "message": f"商品 {product_name} 不存在於 "
                     f"{merchant_name} 的菜單中",
                 }
 
+            total_price += price * quantity
+            order_items.append(
+                {
+                    "product": product_name,
+                    "quantity": quantity,
+                    "price_per_unit": price,
+                },
+            )
+
         # 檢查餘額是否足夠
         if total_price >= self.users[username]["balance"]:
             return {"status": False, "message": "餘額不足，無法下單"}
@@ -243,6 +275,7 @@ class FoodPlatformApi(SharedState):
             "total_price": total_price,
         }
         self.orders.append(order)
+        self._orders_by_user.setdefault(username, []).append(order)
         return {
             "status": True,
             "message": f"外賣訂單成功下單給 {merchant_name}，" f"總金額為 {total_price} 元",
@@ -272,9 +305,7 @@ class FoodPlatformApi(SharedState):
         user_name: str,
     ) -> dict[str, bool | str | list[dict[str, str | int | float]]]:
         """查看用戶的所有訂單"""
-        user_orders = [
-            order for order in self.orders if order["user_name"] == user_name
-        ]
+        user_orders = self._orders_by_user.get(user_name)
 
         if not user_orders:
             return {"status": False, "message": "用戶沒有訂單記錄"}
@@ -286,12 +317,13 @@ class FoodPlatformApi(SharedState):
         keyword: str,
     ) -> dict[str, bool | str | list[dict[str, str | float]]]:
         """根據關鍵字搜索訂單。"""
+        keyword = keyword.lower()
         matched_orders = [
             order
             for order in self.orders
-            if keyword.lower() in order["merchant_name"].lower()
+            if keyword in order["merchant_name"].lower()
             or any(
-                keyword.lower() in item.lower()
+                keyword in item["product"].lower()
                 for item in order.get("items", [])
             )
         ]
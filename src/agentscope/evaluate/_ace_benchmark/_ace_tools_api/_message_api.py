@@ -1,22 +1,124 @@
 # -*- coding: utf-8 -*-
 """The Message API in the ACEBench evaluation."""
-from datetime import datetime
-
-from ._shared_state import SharedState
+from datetime import date
+from typing import Callable
+
+from ._shared_state import SharedState, requires_device_state
+
+
+# 六個用戶，運行中只讀，所有實例共享
+_USER_LIST: dict[str, dict[str, str | int]] = {
+    "Eve": {
+        "user_id": "USR100",
+        "phone_number": "123-456-7890",
+        "occupation": "Software Engineer",
+    },
+    "Frank": {
+        "user_id": "USR101",
+        "phone_number": "234-567-8901",
+        "occupation": "Data Scientist",
+    },
+    "Grace": {
+        "user_id": "USR102",
+        "phone_number": "345-678-9012",
+        "occupation": "Product Manager",
+    },
+    "Helen": {
+        "user_id": "USR103",
+        "phone_number": "456-789-0123",
+        "occupation": "UX Designer",
+    },
+    "Isaac": {
+        "user_id": "USR104",
+        "phone_number": "567-890-1234",
+        "occupation": "DevOps Engineer",
+    },
+    "Jack": {
+        "user_id": "USR105",
+        "phone_number": "678-901-2345",
+        "occupation": "Marketing Specialist",
+    },
+}
+
+# 六個用戶之間的初始短信記錄。短信會被刪除，每個實例複製一份
+# 信息1和reminder配合  信息2和food配合
+_INBOX_SEED: dict[int, dict[str, str | int]] = {
+    1: {
+        "sender_id": "USR100",
+        "receiver_id": "USR101",
+        "message": "Hey Frank, don't forget about our meeting on "
+        "2024-06-11 at 4 PM in Conference Room 1.",
+        "time": "2024-06-09",
+    },
+    2: {
+        "sender_id": "USR101",
+        "receiver_id": "USR102",
+        "message": """你能幫我點一個\"瑪格麗特披薩\"的外賣嗎,商家是達美樂。""",
+        "time": "2024-03-09",
+    },
+    3: {
+        "sender_id": "USR102",
+        "receiver_id": "USR103",
+        "message": "幫我查一些喜茶有哪些奶茶外賣，買一杯便宜些的奶茶。"
+        "買完以後記得回覆我,回覆的內容是（已經買好了）",
+        "time": "2023-12-05",
+    },
+    4: {
+        "sender_id": "USR103",
+        "receiver_id": "USR102",
+        "message": "No problem Helen, I can assist you.",
+        "time": "2024-09-09",
+    },
+    5: {
+        "sender_id": "USR104",
+        "receiver_id": "USR105",
+        "message": "Isaac, are you available for a call?",
+        "time": "2024-06-06",
+    },
+    6: {
+        "sender_id": "USR105",
+        "receiver_id": "USR104",
+        "message": "Yes Jack, let's do it in 30 minutes.",
+        "time": "2024-01-15",
+    },
+}
+
+# 用戶名 -> user_id，查詢時一次字典查找即可取得ID
+_NAME_TO_UID: dict[str, str] = {
+    name: info["user_id"] for name, info in _USER_LIST.items()
+}
 
 
 class MessageApi(SharedState):
     """The message Api in the ACEBench evaluation."""
 
-    tool_functions: list[str] = [
-        "send_message",
-        "delete_message",
-        "view_messages_between_users",
-        "search_messages",
-        "get_all_message_times_with_ids",
-        "get_latest_message_id",
-        "get_earliest_message_id",
-    ]
+    __slots__ = (
+        "max_capacity",
+        "user_list",
+        "_name_to_uid",
+        "inbox",
+        "message_id_counter",
+        "_message_times",
+        "_latest_message_id",
+        "_earliest_message_id",
+        "_untimed_message_ids",
+        "_message_ids_by_pair",
+        "_message_ids_by_user",
+        "_message_lower",
+        "_inbox_state",
+    )
+
+    tool_functions: frozenset[str] = frozenset(
+        {
+            "send_message",
+            "delete_message",
+            "view_messages_between_users",
+            "search_messages",
+            "get_all_message_times_with_ids",
+            "get_latest_message_id",
+            "get_earliest_message_id",
+        },
+    )
 
     def __init__(self, share_state: dict) -> None:
         """Initialize the MessageApi with shared state."""
@@ -24,98 +126,120 @@ class MessageApi(SharedState):
 
         # 設置六個用戶
         self.max_capacity = 6
-        self.user_list: dict[str, dict[str, str | int]] = {
-            "Eve": {
-                "user_id": "USR100",
-                "phone_number": "123-456-7890",
-                "occupation": "Software Engineer",
-            },
-            "Frank": {
-                "user_id": "USR101",
-                "phone_number": "234-567-8901",
-                "occupation": "Data Scientist",
-            },
-            "Grace": {
-                "user_id": "USR102",
-                "phone_number": "345-678-9012",
-                "occupation": "Product Manager",
-            },
-            "Helen": {
-                "user_id": "USR103",
-                "phone_number": "456-789-0123",
-                "occupation": "UX Designer",
-            },
-            "Isaac": {
-                "user_id": "USR104",
-                "phone_number": "567-890-1234",
-                "occupation": "DevOps Engineer",
-            },
-            "Jack": {
-                "user_id": "USR105",
-                "phone_number": "678-901-2345",
-                "occupation": "Marketing Specialist",
-            },
-        }
+        self.user_list: dict[str, dict[str, str | int]] = _USER_LIST
+        self._name_to_uid: dict[str, str] = _NAME_TO_UID
 
         # 設置六個用戶之間的短信記錄
-        # 信息1和reminder配合  信息2和food配合
         self.inbox: dict[int, dict[str, str | int]] = {
-            1: {
-                "sender_id": "USR100",
-                "receiver_id": "USR101",
-                "message": "Hey Frank, don't forget about our meeting on "
-                "2024-06-11 at 4 PM in Conference Room 1.",
-                "time": "2024-06-09",
-            },
-            2: {
-                "sender_id": "USR101",
-                "receiver_id": "USR102",
-                "message": """你能幫我點一個\"瑪格麗特披薩\"的外賣嗎,商家是達美樂。""",
-                "time": "2024-03-09",
-            },
-            3: {
-                "sender_id": "USR102",
-                "receiver_id": "USR103",
-                "message": "幫我查一些喜茶有哪些奶茶外賣，買一杯便宜些的奶茶。"
-                "買完以後記得回覆我,回覆的內容是（已經買好了）",
-                "time": "2023-12-05",
-            },
-            4: {
-                "sender_id": "USR103",
-                "receiver_id": "USR102",
-                "message": "No problem Helen, I can assist you.",
-                "time": "2024-09-09",
-            },
-            5: {
-                "sender_id": "USR104",
-                "receiver_id": "USR105",
-                "message": "Isaac, are you available for a call?",
-                "time": "2024-06-06",
-            },
-            6: {
-                "sender_id": "USR105",
-                "receiver_id": "USR104",
-                "message": "Yes Jack, let's do it in 30 minutes.",
-                "time": "2024-01-15",
-            },
+            msg_id: dict(msg_data) for msg_id, msg_data in _INBOX_SEED.items()
         }
 
         self.message_id_counter: int = 6
 
+        # 帶時間的短信 ID -> 解析後的日期，以及其中最新、最早的短信 ID。
+        # 時間都是 "YYYY-MM-DD" 格式，加入索引時以 fromisoformat 解析一次，
+        # 發送和刪除短信時增量維護，查詢時直接讀取
+        self._message_times: dict[int, date] = {}
+        self._latest_message_id: int | None = None
+        self._earliest_message_id: int | None = None
+        # 不帶時間的短信 ID，按發送順序排列。send_message 發送的短信沒有
+        # 時間，視為晚於所有帶時間的短信
+        self._untimed_message_ids: list[int] = []
+
+        # 短信的二級索引：(sender_id, receiver_id) -> 短信 ID 列表、
+        # user_id -> 其發送或接收的短信 ID 列表，以及小寫後的短信內容。
+        # 短信 ID 單調遞增，列表保持 inbox 中的順序
+        self._message_ids_by_pair: dict[tuple[str, str], list[int]] = {}
+        self._message_ids_by_user: dict[str, list[int]] = {}
+        self._message_lower: dict[int, str] = {}
+        # 以字串為鍵的 inbox 鏡像，供 get_state_dict 直接返回
+        self._inbox_state: dict[str, dict[str, str | int]] = {}
+        for msg_id in self.inbox:
+            self._index_message(msg_id)
+
+    def _index_message(self, msg_id: int) -> None:
+        """Add an inbox message to the secondary indexes."""
+        msg_data = self.inbox[msg_id]
+        sender_id = msg_data["sender_id"]
+        receiver_id = msg_data["receiver_id"]
+        self._message_ids_by_pair.setdefault(
+            (sender_id, receiver_id),
+            [],
+        ).append(msg_id)
+        self._message_ids_by_user.setdefault(sender_id, []).append(msg_id)
+        if receiver_id != sender_id:
+            self._message_ids_by_user.setdefault(receiver_id, []).append(
+                msg_id,
+            )
+        self._message_lower[msg_id] = str(msg_data["message"]).lower()
+        self._inbox_state[str(msg_id)] = msg_data
+
+        if "time" not in msg_data:
+            self._untimed_message_ids.append(msg_id)
+            return
+        msg_time = date.fromisoformat(str(msg_data["time"]))
+        self._message_times[msg_id] = msg_time
+        # 時間相同時保留先加入的短信
+        if (
+            self._latest_message_id is None
+            or msg_time > self._message_times[self._latest_message_id]
+        ):
+            self._latest_message_id = msg_id
+        if (
+            self._earliest_message_id is None
+            or msg_time < self._message_times[self._earliest_message_id]
+        ):
+            self._earliest_message_id = msg_id
+
+    def _unindex_message(self, msg_id: int, msg_data: dict) -> None:
+        """Remove a deleted message from the secondary indexes."""
+        sender_id = msg_data["sender_id"]
+        receiver_id = msg_data["receiver_id"]
+        self._message_ids_by_pair[(sender_id, receiver_id)].remove(msg_id)
+        self._message_ids_by_user[sender_id].remove(msg_id)
+        if receiver_id != sender_id:
+            self._message_ids_by_user[receiver_id].remove(msg_id)
+        del self._message_lower[msg_id]
+        del self._inbox_state[str(msg_id)]
+
+        if "time" not in msg_data:
+            self._untimed_message_ids.remove(msg_id)
+            return
+        del self._message_times[msg_id]
+        # 只有刪除的正好是最新或最早的短信時才需要重新查找
+        if msg_id == self._latest_message_id:
+            self._latest_message_id = self._find_message_id_by_time(max)
+        if msg_id == self._earliest_message_id:
+            self._earliest_message_id = self._find_message_id_by_time(min)
+
+    def _find_message_id_by_time(
+        self,
+        pick: Callable[..., int | None],
+    ) -> int | None:
+        """Find the message ID with the latest (`max`) or earliest (`min`)
+        time. Ties resolve to the first message in the inbox."""
+        return pick(
+            self._message_times,
+            key=self._message_times.__getitem__,
+            default=None,
+        )
+
     def get_state_dict(self) -> dict:
         """Get the current state dict of the MessageApi."""
 
-        # To avoid the error in ACEBench dataset
-        inbox_state = {}
-        for key, value in self.inbox.items():
-            inbox_state[str(key)] = value
-
+        # To avoid the error in ACEBench dataset, the inbox is exported with
+        # string keys. The mirror is maintained on send and delete, and is
+        # copied so that callers cannot change the app state through it.
         return {
             "MessageApi": {
-                "inbox": inbox_state,
+                "inbox": dict(self._inbox_state),
             },
         }
 
+    @requires_device_state(
+        logged_in_error="device未登錄，無法發送短信",
+        wifi_error="wifi關閉，此時不能發送信息",
+    )
     def send_message(
         self,
         sender_name: str,
@@ -132,12 +256,6 @@ class MessageApi(SharedState):
             message (`str`):
                 要發送的消息內容。
         """
-        if not self.logged_in:
-            return {"status": False, "message": "device未登錄，無法發送短信"}
-
-        if not self.wifi:
-            return {"status": False, "message": "wifi關閉，此時不能發送信息"}
-
         if len(self.inbox) >= self.max_capacity:
             return {
                 "status": False,
@@ -145,15 +263,11 @@ class MessageApi(SharedState):
             }
 
         # 驗證發送者和接收者是否存在
-        if (
-            sender_name not in self.user_list
-            or receiver_name not in self.user_list
-        ):
+        sender_id = self._name_to_uid.get(sender_name)
+        receiver_id = self._name_to_uid.get(receiver_name)
+        if sender_id is None or receiver_id is None:
             return {"status": False, "message": "發送者或接收者不存在"}
 
-        sender_id = self.user_list[sender_name]["user_id"]
-        receiver_id = self.user_list[receiver_name]["user_id"]
-
         # 將短信添加到inbox
         self.message_id_counter += 1
         self.inbox[self.message_id_counter] = {
@@ -161,9 +275,13 @@ class MessageApi(SharedState):
             "receiver_id": receiver_id,
             "message": message,
         }
+        self._index_message(self.message_id_counter)
 
         return {"status": True, "message": f"短信成功發送給{receiver_name}。"}
 
+    @requires_device_state(
+        logged_in_error="device未登錄，無法刪除短信",
+    )
     def delete_message(self, message_id: int) -> dict[str, bool | str]:
         """根據消息 ID 刪除一條消息。
 
@@ -171,14 +289,15 @@ class MessageApi(SharedState):
             message_id (`int`):
                 要刪除的消息的 ID。
         """
-        if not self.logged_in:
-            return {"status": False, "message": "device未登錄，無法刪除短信"}
         if message_id not in self.inbox:
             return {"status": False, "message": "短信ID不存在"}
 
-        del self.inbox[message_id]
+        self._unindex_message(message_id, self.inbox.pop(message_id))
         return {"status": True, "message": f"短信ID {message_id} 已成功刪除。"}
 
+    @requires_device_state(
+        logged_in_error="device未登錄，無法查看短信信息",
+    )
     def view_messages_between_users(
         self,
         sender_name: str,
@@ -192,36 +311,27 @@ class MessageApi(SharedState):
             receiver_name (`str`):
                 接收消息的用戶姓名。
         """
-        if not self.logged_in:
-            return {
-                "status": False,
-                "message": "device未登錄，無法查看短信信息",
-            }
-
-        if sender_name not in self.user_list:
+        sender_id = self._name_to_uid.get(sender_name)
+        if sender_id is None:
             return {"status": False, "message": "發送者不存在"}
 
-        if receiver_name not in self.user_list:
+        receiver_id = self._name_to_uid.get(receiver_name)
+        if receiver_id is None:
             return {"status": False, "message": "接收者不存在"}
 
-        sender_id = self.user_list[sender_name]["user_id"]
-        receiver_id = self.user_list[receiver_name]["user_id"]
-        messages_between_users = []
-
-        # 遍歷 inbox，找出 sender_id 發送給 receiver_id 的短信
-        for msg_id, msg_data in self.inbox.items():
-            if (
-                msg_data["sender_id"] == sender_id
-                and msg_data["receiver_id"] == receiver_id
-            ):
-                messages_between_users.append(
-                    {
-                        "id": msg_id,
-                        "sender": sender_name,
-                        "receiver": receiver_name,
-                        "message": msg_data["message"],
-                    },
-                )
+        # 從索引取出 sender_id 發送給 receiver_id 的短信
+        messages_between_users = [
+            {
+                "id": msg_id,
+                "sender": sender_name,
+                "receiver": receiver_name,
+                "message": self.inbox[msg_id]["message"],
+            }
+            for msg_id in self._message_ids_by_pair.get(
+                (sender_id, receiver_id),
+                (),
+            )
+        ]
 
         if not messages_between_users:
             return {"status": False, "message": "沒有找到相關的短信記錄"}
@@ -241,98 +351,77 @@ class MessageApi(SharedState):
             keyword (`str`):
                 要在消息中搜索的關鍵字。
         """
-        if user_name not in self.user_list:
+        user_id = self._name_to_uid.get(user_name)
+        if user_id is None:
             return {"status": False, "message": "用戶不存在"}
 
-        user_id = self.user_list[user_name]["user_id"]
-        matched_messages = []
-
-        # 遍歷 inbox，找到發送或接收中包含關鍵詞的消息
-        for msg_id, msg_data in self.inbox.items():
-            if (
-                user_id in (msg_data["sender_id"], msg_data["receiver_id"])
-                and keyword.lower() in msg_data["message"].lower()
-            ):
-                matched_messages.append(
-                    {
-                        "id": msg_id,
-                        "sender_id": msg_data["sender_id"],
-                        "receiver_id": msg_data["receiver_id"],
-                        "message": msg_data["message"],
-                    },
-                )
+        keyword = keyword.lower()
+        inbox = self.inbox
+        message_lower = self._message_lower
+
+        # 只遍歷該用戶發送或接收的短信，找到包含關鍵詞的消息
+        matched_messages = [
+            {
+                "id": msg_id,
+                "sender_id": inbox[msg_id]["sender_id"],
+                "receiver_id": inbox[msg_id]["receiver_id"],
+                "message": inbox[msg_id]["message"],
+            }
+            for msg_id in self._message_ids_by_user.get(user_id, ())
+            if keyword in message_lower[msg_id]
+        ]
 
         if not matched_messages:
             return {"status": False, "message": "沒有找到包含關鍵詞的短信"}
 
         return {"status": True, "messages": matched_messages}
 
+    @requires_device_state(
+        logged_in_error="device未登錄，獲取所有短信的時間以及對應的短信編號。",
+    )
     def get_all_message_times_with_ids(
         self,
     ) -> dict:
         """獲取所有短信的時間以及對應的短信編號。"""
-        if not self.logged_in:
-            return {
-                "status": False,
-                "message": "device未登錄，獲取所有短信的時間以及對應的短信編號。",
-            }
+        # 剛發送的短信沒有時間，對應的值為 None
         message_times_with_ids = {
-            msg_id: msg_data["time"] for msg_id, msg_data in self.inbox.items()
+            msg_id: msg_data.get("time")
+            for msg_id, msg_data in self.inbox.items()
         }
         return message_times_with_ids
 
+    @requires_device_state(
+        logged_in_error="device未登錄，無法獲取最新發送的短信ID。",
+    )
     def get_latest_message_id(self) -> dict:
         """獲取最近發送的消息的 ID。"""
-        if not self.logged_in:
-            return {
-                "status": False,
-                "message": "device未登錄，無法獲取最新發送的短信ID。",
-            }
         if not self.inbox:
             return {"status": False, "message": "短信記錄為空"}
 
-        # 遍歷所有短信，找出時間最新的短信
-        latest_message_id = None
-        latest_time = None
-
-        for message_id, message_data in self.inbox.items():
-            message_time = datetime.strptime(
-                str(message_data["time"]),
-                "%Y-%m-%d",
-            )
-            if latest_time is None or message_time > latest_time:
-                latest_time = message_time
-                latest_message_id = message_id
-
+        # 剛發送的短信晚於所有帶時間的短信，其中最後發送的一條最新
+        if self._untimed_message_ids:
+            latest_message_id = self._untimed_message_ids[-1]
+        else:
+            latest_message_id = self._latest_message_id
         return {
             "status": True,
             "message": f"最新的短信ID是 {latest_message_id}",
             "message_id": latest_message_id,
         }
 
+    @requires_device_state(
+        logged_in_error="device未登錄，無法獲取最早發送的短信ID",
+    )
     def get_earliest_message_id(self) -> dict:
         """獲取最早發送的消息的 ID。"""
-        if not self.logged_in:
-            return {
-                "status": False,
-                "message": "device未登錄，無法獲取最早發送的短信ID",
-            }
         if not self.inbox:
             return {"status": False, "message": "短信記錄為空"}
 
-        # 遍歷所有短信，找出時間最早的短信
-        earliest_message_id = None
-        earliest_time = None
-
-        for message_id, message_data in self.inbox.items():
-            message_time = datetime.strptime(
-                str(message_data["time"]),
-                "%Y-%m-%d",
-            )
-            if earliest_time is None or message_time < earliest_time:
-                earliest_time = message_time
-                earliest_message_id = message_id
-
+        # 沒有帶時間的短信時，最早的是剩下的短信中最先發送的一條
+        if self._earliest_message_id is not None:
+            earliest_message_id = self._earliest_message_id
+        else:
+            earliest_message_id = self._untimed_message_ids[0]
         return {
             "status": True,
             "message": f"最早的短信ID是 {earliest_message_id}",
@@ -2,57 +2,75 @@
 """The reminder API in ACEBench simulation tools."""
 from datetime import datetime
 
-from ._shared_state import SharedState
+from ._shared_state import SharedState, requires_device_state
+
+
+# 初始提醒。提醒會被刪除或標記為已通知，每個實例複製一份
+_REMINDER_LIST_SEED: dict[int, dict] = {
+    1: {
+        "reminder_id": 1001,
+        "title": "Doctor's Appointment",
+        "description": "Visit Dr. Smith for a checkup.",
+        "time": "2024-07-15 09:30",
+        "notified": False,
+    },
+    2: {
+        "reminder_id": 1002,
+        "title": "Team Meeting",
+        "description": "Monthly project review with the team.",
+        "time": "2024-07-17 11:00",
+        "notified": False,
+    },
+    3: {
+        "reminder_id": 1003,
+        "title": "To-do list",
+        "description": '首先幫Frank在"盒馬生鮮"點外賣，'
+        '需要定兩個"生鮮大禮包"，再發短信告訴Frank：'
+        '"購買商品的價格是()元"。要把括號換成實際金額，'
+        "保留一位小數。",
+        "time": "2024-07-16 11:00",
+        "notified": False,
+    },
+}
 
 
 class ReminderApi(SharedState):
     """The reminder Api in the ACEBench evaluation."""
 
-    tool_functions: list[str] = [
-        "view_reminder_by_title",
-        "add_reminder",
-        "delete_reminder",
-        "view_all_reminders",
-        "mark_as_notified",
-        "search_reminders",
-    ]
+    __slots__ = (
+        "max_capacity",
+        "reminder_list",
+        "reminder_id_counter",
+        "_reminders_by_title",
+    )
+
+    tool_functions: frozenset[str] = frozenset(
+        {
+            "view_reminder_by_title",
+            "add_reminder",
+            "delete_reminder",
+            "view_all_reminders",
+            "mark_as_notified",
+            "search_reminders",
+        },
+    )
 
     def __init__(self, share_state: dict) -> None:
         """Initialize the Reminder Api in the ACEBench evaluation."""
         super().__init__(share_state)
 
         self.max_capacity = 6
-        self.reminder_list: dict[
-            int,
-            dict,
-        ] = {
-            1: {
-                "reminder_id": 1001,
-                "title": "Doctor's Appointment",
-                "description": "Visit Dr. Smith for a checkup.",
-                "time": "2024-07-15 09:30",
-                "notified": False,
-            },
-            2: {
-                "reminder_id": 1002,
-                "title": "Team Meeting",
-                "description": "Monthly project review with the team.",
-                "time": "2024-07-17 11:00",
-                "notified": False,
-            },
-            3: {
-                "reminder_id": 1003,
-                "title": "To-do list",
-                "description": '首先幫Frank在"盒馬生鮮"點外賣，'
-                '需要定兩個"生鮮大禮包"，再發短信告訴Frank：'
-                '"購買商品的價格是()元"。要把括號換成實際金額，'
-                "保留一位小數。",
-                "time": "2024-07-16 11:00",
-                "notified": False,
-            },
+        self.reminder_list: dict[int, dict] = {
+            reminder_id: dict(reminder)
+            for reminder_id, reminder in _REMINDER_LIST_SEED.items()
         }
         self.reminder_id_counter: int = 3
 
+        # 標題 -> 提醒，標題重複時保留最早添加的一個，與按順序查找的結果一致
+        self._reminders_by_title: dict[str, dict] = {}
+        for reminder in self.reminder_list.values():
+            self._reminders_by_title.setdefault(reminder["title"], reminder)
+
     def get_state_dict(self) -> dict:
         """Get the current state dict of the ReminderApi."""
         return {
@@ -65,6 +83,9 @@ class ReminderApi(SharedState):
         """檢查備忘錄容量是否已滿。"""
         return len(self.reminder_list) >= self.max_capacity
 
+    @requires_device_state(
+        logged_in_error="device未登錄，無法查看提醒",
+    )
     def view_reminder_by_title(
         self,
         title: str,
@@ -78,14 +99,15 @@ class ReminderApi(SharedState):
             dict[str, str | bool | dict[str, str | bool | datetime]]:
                 包含查找狀態和提醒詳情的字典。
         """
-        if not self.logged_in:
-            return {"status": False, "message": "device未登錄，無法查看提醒"}
-        for reminder in self.reminder_list.values():
-            if reminder["title"] == title:
-                return {"status": True, "reminder": reminder}
+        reminder = self._reminders_by_title.get(title)
+        if reminder is not None:
+            return {"status": True, "reminder": reminder}
 
         return {"status": False, "message": f"沒有找到標題為 '{title}' 的提醒"}
 
+    @requires_device_state(
+        logged_in_error="device未登錄，無法添加一個新的提醒",
+    )
     def add_reminder(
         self,
         title: str,
@@ -102,11 +124,6 @@ class ReminderApi(SharedState):
         Returns:
             dict[str, bool | str]: 包含添加狀態和結果的字典。
         """
-        if not self.logged_in:
-            return {
-                "status": False,
-                "message": "device未登錄，無法添加一個新的提醒",
-            }
         if self._check_capacity():
             return {"status": False, "message": "提醒容量已滿，無法添加新的提醒"}
 
@@ -119,8 +136,15 @@ class ReminderApi(SharedState):
             "time": time,
             "notified": False,
         }
+        self._reminders_by_title.setdefault(
+            title,
+            self.reminder_list[reminder_id],
+        )
         return {"status": True, "message": f"提醒 '{title}' 已成功添加"}
 
+    @requires_device_state(
+        logged_in_error="device未登錄，無法刪除指定的提醒",
+    )
     def delete_reminder(self, reminder_id: int) -> dict[str, bool | str]:
         """刪除指定的提醒。
 
@@ -130,12 +154,18 @@ class ReminderApi(SharedState):
         Returns:
             dict[str, bool | str]: 包含刪除狀態和結果的字典。
         """
-        if not self.logged_in:
-            return {"status": False, "message": "device未登錄，無法刪除指定的提醒"}
         if reminder_id not in self.reminder_list:
             return {"status": False, "message": "提醒ID不存在"}
 
-        del self.reminder_list[reminder_id]
+        reminder = self.reminder_list.pop(reminder_id)
+        title = reminder["title"]
+        if self._reminders_by_title.get(title) is reminder:
+            # 被刪除的是該標題的索引項，改由下一個同名提醒（如有）接替
+            del self._reminders_by_title[title]
+            for other in self.reminder_list.values():
+                if other["title"] == title:
+                    self._reminders_by_title[title] = other
+                    break
         return {"status": True, "message": f"提醒ID {reminder_id} 已成功刪除"}
 
     def view_all_reminders(
@@ -193,12 +223,13 @@ class ReminderApi(SharedState):
             `dict`:
                 包含匹配提醒的字典列表。
         """
+        keyword = keyword.lower()
         matched_reminders = []
 
         for reminder in self.reminder_list.values():
             if (
-                keyword.lower() in reminder["title"].lower()
-                or keyword.lower() in reminder["description"].lower()
+                keyword in reminder["title"].lower()
+                or keyword in reminder["description"].lower()
             ):
                 matched_reminders.append(
                     {
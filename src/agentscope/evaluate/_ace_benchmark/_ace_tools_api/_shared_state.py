@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 """The shared state class for ACEBench simulation tools."""
+from functools import wraps
+from typing import Any, Callable
 
 
 class SharedState:
     """The sharing state class for ACEBench simulation tools."""
 
+    __slots__ = ("_shared_state",)
+
     def __init__(self, shared_state: dict) -> None:
         """Initialize the shared state"""
         self._shared_state = shared_state
@@ -18,3 +22,38 @@ class SharedState:
     def logged_in(self) -> bool:
         """The logged in state"""
         return self._shared_state["logged_in"]
+
+
+def requires_device_state(
+    logged_in_error: str | None = None,
+    wifi_error: str | None = None,
+) -> Callable[[Callable], Callable]:
+    """Guard a tool function of a `SharedState` app by the device state.
+
+    The login state is checked before the WI-FI state. When a required state
+    is off, a new failure response is returned without calling the tool
+    function.
+
+    Args:
+        logged_in_error (`str | None`, optional):
+            The failure message when the device is not logged in. The login
+            state is not checked if `None`.
+        wifi_error (`str | None`, optional):
+            The failure message when the WI-FI is off. The WI-FI state is not
+            checked if `None`.
+    """
+    def decorator(func: Callable) -> Callable:
+        """Wrap the tool function with the state checks."""
+
+        @wraps(func)
+        def wrapper(self: SharedState, *args: Any, **kwargs: Any) -> Any:
+            """Check the device state before calling the tool function."""
+            if logged_in_error is not None and not self.logged_in:
+                return {"status": False, "message": logged_in_error}
+            if wifi_error is not None and not self.wifi:
+                return {"status": False, "message": wifi_error}
+            return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
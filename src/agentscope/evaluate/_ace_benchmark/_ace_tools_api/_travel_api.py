@@ -10,6 +10,23 @@
 from datetime import datetime, timedelta
 
 
+# 會員等級 -> 艙位 -> 免費托運行李數量
+_FREE_BAGGAGE_ALLOWANCE: dict[str, dict[str, int]] = {
+    "regular": {"經濟艙": 1, "商務艙": 2},
+    "silver": {"經濟艙": 2, "商務艙": 3},
+    "gold": {"經濟艙": 3, "商務艙": 3},
+}
+
+# 艙位 -> 航班信息中對應的價格字段
+_CABIN_PRICE_KEYS: dict[str, str] = {
+    "經濟艙": "economy_price",
+    "商務艙": "business_price",
+}
+
+# 有效的支付方式
+_PAYMENT_METHODS: frozenset[str] = frozenset({"cash", "bank"})
+
+
 class TravelApi:
     """旅行預訂系統類。
 
@@ -17,14 +34,16 @@ class TravelApi:
     支持直飛和中轉航班查詢、航班預訂、預訂修改和取消等功能。
     """
 
-    tool_functions: list[str] = [
-        "get_user_details",
-        "get_flight_details",
-        "get_reservation_details",
-        "reserve_flight",
-        "cancel_reservation",
-        "modify_flight",
-    ]
+    tool_functions: frozenset[str] = frozenset(
+        {
+            "get_user_details",
+            "get_flight_details",
+            "get_reservation_details",
+            "reserve_flight",
+            "cancel_reservation",
+            "modify_flight",
+        },
+    )
 
     def __init__(self) -> None:
         """初始化旅行系統。
@@ -181,8 +200,38 @@ class TravelApi:
             },
         ]
 
-        # 初始化預訂列表
-        self.reservations = [
+        # 航班索引：(出發地, 目的地)、出發地、目的地 -> 航班列表，
+        # 保持 flights 中的順序，並引用同一批航班字典，座位變化無需同步
+        self._flights_by_route: dict[tuple[str, str], list[dict]] = {}
+        self._flights_by_origin: dict[str, list[dict]] = {}
+        self._flights_by_destination: dict[str, list[dict]] = {}
+        # 航班號 -> 航班列表，同一航班號可能對應多個航班
+        self._flights_by_no: dict[str, list[dict]] = {}
+        # id(航班字典) -> (起飛時間, 降落時間)，初始化時解析一次。
+        # 航班字典會原樣返回給調用方，因此不在其中添加字段
+        self._flight_times: dict[int, tuple[datetime, datetime]] = {}
+        for flight in self.flights:
+            self._flight_times[id(flight)] = (
+                datetime.strptime(flight["depart_time"], "%Y-%m-%d %H:%M:%S"),
+                datetime.strptime(flight["arrival_time"], "%Y-%m-%d %H:%M:%S"),
+            )
+            self._flights_by_no.setdefault(flight["flight_no"], []).append(
+                flight,
+            )
+            self._flights_by_route.setdefault(
+                (flight["origin"], flight["destination"]),
+                [],
+            ).append(flight)
+            self._flights_by_origin.setdefault(flight["origin"], []).append(
+                flight,
+            )
+            self._flights_by_destination.setdefault(
+                flight["destination"],
+                [],
+            ).append(flight)
+
+        # 初始化預訂，按預訂ID保存，字典保持插入順序
+        reservations = [
             {
                 "reservation_id": "res_1",
                 "user_id": "user1",
@@ -225,12 +274,44 @@ class TravelApi:
             },
         ]
 
+        self.reservations: dict[str, dict] = {}
+        # 用戶ID -> 該用戶的預訂列表，與 reservations 引用同一批預訂字典
+        self._reservations_by_user: dict[str, list[dict]] = {}
+        for reservation in reservations:
+            self._add_reservation(reservation)
+        # 下一個預訂號的序號，與 reservations 的大小解耦
+        self._next_reservation_number = len(self.reservations) + 1
+
+    def _add_reservation(self, reservation: dict) -> None:
+        """保存預訂並加入用戶索引。"""
+        self.reservations[reservation["reservation_id"]] = reservation
+        self._reservations_by_user.setdefault(
+            reservation["user_id"],
+            [],
+        ).append(reservation)
+
+    def _find_user_reservation(
+        self,
+        reservation_id: str,
+        user_id: str,
+    ) -> dict | None:
+        """查找屬於指定用戶的預訂，不存在或用戶不匹配時返回None。"""
+        reservation = self.reservations.get(reservation_id)
+        if reservation is None or reservation["user_id"] != user_id:
+            return None
+        return reservation
+
+    def _find_flight(self, flight_no: str) -> dict | None:
+        """按航班號查找航班，航班號重複時返回最早的一個，不存在時返回None。"""
+        flights = self._flights_by_no.get(flight_no)
+        return flights[0] if flights else None
+
     def get_state_dict(self) -> dict:
         """獲取當前TravelApi的狀態字典。"""
         return {
             "Travel": {
                 "users": self.users,
-                "reservations": self.reservations,
+                "reservations": list(self.reservations.values()),
             },
         }
 
@@ -250,38 +331,20 @@ class TravelApi:
         Returns:
             list[dict] | str: 符合條件的航班列表或無航班的提示信息。
         """
-        flights = self.flights
-
-        # 過濾出發地
-        if origin:
-            flights = [
-                flight for flight in flights if flight["origin"] == origin
-            ]
-
-        # 過濾目的地
-        if destination:
-            flights = [
-                flight
-                for flight in flights
-                if flight["destination"] == destination
-            ]
+        # 按出發地和目的地從索引中取出航班
+        if origin and destination:
+            flights = self._flights_by_route.get((origin, destination), [])
+        elif origin:
+            flights = self._flights_by_origin.get(origin, [])
+        elif destination:
+            flights = self._flights_by_destination.get(destination, [])
+        else:
+            flights = self.flights
+
         if len(flights) == 0:
             return "沒有符合條件的直達航班"
-        # 返回查詢結果
-        return [
-            {
-                "flight_no": flight["flight_no"],
-                "origin": flight["origin"],
-                "destination": flight["destination"],
-                "depart_time": flight["depart_time"],
-                "arrival_time": flight["arrival_time"],
-                "status": flight["status"],
-                "seats_available": flight["seats_available"],
-                "economy_price": flight["economy_price"],
-                "business_price": flight["business_price"],
-            }
-            for flight in flights
-        ]
+        # 返回查詢結果，航班字典只包含公開字段，淺拷貝即可避免調用方修改航班數據
+        return [dict(flight) for flight in flights]
 
     def get_user_details(self, user_id: str, password: str) -> dict:
         """根據用戶名和密碼查詢用戶信息。
@@ -293,8 +356,8 @@ class TravelApi:
         Returns:
             dict: 用戶信息字典（不包含密碼）或錯誤信息。
         """
-        user = self.users.get(user_id)
-        if user and user["password"] == password:
+        user = self._find_authenticated_user(user_id, password)
+        if user is not None:
             return {
                 key: value for key, value in user.items() if key != "password"
             }
@@ -317,31 +380,17 @@ class TravelApi:
         """
         # 根據預訂ID或用戶ID篩選預訂信息
         if reservation_id:
-            reservations = [
-                reservation
-                for reservation in self.reservations
-                if reservation["reservation_id"] == reservation_id
-            ]
+            reservation = self.reservations.get(reservation_id)
+            reservations = [] if reservation is None else [reservation]
         elif user_id:
-            reservations = [
-                reservation
-                for reservation in self.reservations
-                if reservation["user_id"] == user_id
-            ]
+            reservations = self._reservations_by_user.get(user_id, [])
         else:
             return {"status": "error", "message": "請提供有效的預訂ID或用戶ID"}
 
         # 對每個預訂，附加航班信息
         detailed_reservations = []
         for reservation in reservations:
-            flight_info = next(
-                (
-                    flight
-                    for flight in self.flights
-                    if flight["flight_no"] == reservation["flight_no"]
-                ),
-                None,
-            )
+            flight_info = self._find_flight(reservation["flight_no"])
             detailed_reservation = {**reservation, "flight_info": flight_info}
             detailed_reservations.append(detailed_reservation)
 
@@ -358,10 +407,21 @@ class TravelApi:
             `dict`:
                 用戶信息字典或錯誤信息字典。
         """
+        user = self._find_authenticated_user(user_id, password)
+        if user is not None:
+            return user
+        return {"status": "error", "message": "用戶名或密碼不正確"}
+
+    def _find_authenticated_user(
+        self,
+        user_id: str,
+        password: str,
+    ) -> dict | None:
+        """返回用戶ID和密碼匹配的用戶信息，認證失敗時返回None。"""
         user = self.users.get(user_id)
         if user and user["password"] == password:
             return user
-        return {"status": "error", "message": "用戶名或密碼不正確"}
+        return None
 
     def get_baggage_allowance(
         self,
@@ -377,12 +437,10 @@ class TravelApi:
         Returns:
             int: 免費托運行李數量。
         """
-        allowance = {
-            "regular": {"經濟艙": 1, "商務艙": 2},
-            "silver": {"經濟艙": 2, "商務艙": 3},
-            "gold": {"經濟艙": 3, "商務艙": 3},
-        }
-        return allowance.get(membership_level, {}).get(cabin_class, 0)
+        return _FREE_BAGGAGE_ALLOWANCE.get(membership_level, {}).get(
+            cabin_class,
+            0,
+        )
 
     def find_transfer_flights(
         self,
@@ -406,46 +464,46 @@ class TravelApi:
         # 獲取從出發城市到中轉城市的航班
         first_leg_flights: list[dict] = [
             flight
-            for flight in self.flights
-            if flight["origin"] == origin_city
-            and flight["destination"] == transfer_city
-            and flight["status"] == "available"
+            for flight in self._flights_by_route.get(
+                (origin_city, transfer_city),
+                (),
+            )
+            if flight["status"] == "available"
         ]
 
         # 獲取從中轉城市到目的地城市的航班
         second_leg_flights = [
             flight
-            for flight in self.flights
-            if flight["origin"] == transfer_city
-            and flight["destination"] == destination_city
-            and flight["status"] == "available"
+            for flight in self._flights_by_route.get(
+                (transfer_city, destination_city),
+                (),
+            )
+            if flight["status"] == "available"
         ]
 
         # 存儲符合條件的中轉航班
         transfer_flights = []
 
+        # 第二段航班的起飛時間在初始化時已解析，只需取出一次
+        second_legs = [
+            (self._flight_times[id(flight)][0], flight)
+            for flight in second_leg_flights
+        ]
+
         # 遍歷第一段航班和第二段航班，查找符合時間條件的組合
         for first_flight in first_leg_flights:
-            first_arrival = datetime.strptime(
-                first_flight["arrival_time"],
-                "%Y-%m-%d %H:%M:%S",
+            first_arrival = self._flight_times[id(first_flight)][1]
+
+            # 檢查第一班航班降落時間早於第二班航班起飛時間
+            transfer_flights.extend(
+                {
+                    "first_leg": first_flight,
+                    "second_leg": second_flight,
+                }
+                for second_departure, second_flight in second_legs
+                if first_arrival < second_departure
             )
 
-            for second_flight in second_leg_flights:
-                second_departure = datetime.strptime(
-                    str(second_flight["depart_time"]),
-                    "%Y-%m-%d %H:%M:%S",
-                )
-
-                # 檢查第一班航班降落時間早於第二班航班起飛時間
-                if first_arrival < second_departure:
-                    transfer_flights.append(
-                        {
-                            "first_leg": first_flight,
-                            "second_leg": second_flight,
-                        },
-                    )
-
         # 返回符合條件的中轉航班列表
         if transfer_flights:
             return transfer_flights
@@ -468,14 +526,13 @@ class TravelApi:
         Returns:
             float: 額外行李費用。
         """
-        free_baggage = {
-            "regular": {"經濟艙": 1, "商務艙": 2},
-            "silver": {"經濟艙": 2, "商務艙": 3},
-            "gold": {"經濟艙": 3, "商務艙": 3},
-        }
-        free_limit = free_baggage[membership_level][cabin_class]
-        additional_baggage = max(baggage_count - free_limit, 0)
-        return additional_baggage * 50
+        free_limit = _FREE_BAGGAGE_ALLOWANCE[membership_level][cabin_class]
+        return self._extra_baggage_fee(free_limit, baggage_count)
+
+    @staticmethod
+    def _extra_baggage_fee(free_limit: int, baggage_count: int) -> int:
+        """計算超出免費限額的行李費用，每件額外行李50元。"""
+        return max(baggage_count - free_limit, 0) * 50
 
     def update_balance(
         self,
@@ -494,13 +551,16 @@ class TravelApi:
             bool: 如果餘額充足且更新成功，返回 True，否則返回 False。
         """
         if payment_method == "cash":
-            if user["cash_balance"] + amount < 0:
-                return False  # 餘額不足
-            user["cash_balance"] += amount
+            key = "cash_balance"
         elif payment_method == "bank":
-            if user["bank_balance"] + amount < 0:
-                return False  # 余额不足
-            user["bank_balance"] += amount
+            key = "bank_balance"
+        else:
+            return True
+
+        new_balance = user[key] + amount
+        if new_balance < 0:
+            return False  # 餘額不足
+        user[key] = new_balance
         return True
 
     def reserve_flight(
@@ -525,16 +585,17 @@ class TravelApi:
         Returns:
             str: 預訂結果信息。
         """
-        user = self.authenticate_user(user_id, password)
-        if not user:
+        # authenticate_user 認證失敗時返回錯誤字典，不能以真假判斷
+        user = self._find_authenticated_user(user_id, password)
+        if user is None:
             return "認證失敗，請檢查用戶ID和密碼。"
 
         # 檢查航班和座位
         flight = next(
             (
                 f
-                for f in self.flights
-                if f["flight_no"] == flight_no and f["status"] == "available"
+                for f in self._flights_by_no.get(flight_no, [])
+                if f["status"] == "available"
             ),
             None,
         )
@@ -556,22 +617,23 @@ class TravelApi:
         total_cost += baggage_fee
 
         # 檢查支付方式
-        if payment_method not in ["cash", "bank"]:
+        if payment_method not in _PAYMENT_METHODS:
             return "支付方式無效"
 
-        # 更新預定後的餘額
+        # 更新預定後的餘額，user 即認證通過的 self.users[user_id]
         if payment_method == "cash":
-            if total_cost > self.users.get(user_id)["cash_balance"]:
+            if total_cost > user["cash_balance"]:
                 return "cash餘額不足，請考慮換一種支付方式"
-            self.users.get(user_id)["cash_balance"] -= total_cost
+            user["cash_balance"] -= total_cost
         else:
-            if total_cost > self.users.get(user_id)["bank_balance"]:
+            if total_cost > user["bank_balance"]:
                 return "bank餘額不足，請考慮換一種支付方式"
-            self.users.get(user_id)["bank_balance"] -= total_cost
+            user["bank_balance"] -= total_cost
 
         # 更新航班信息並生成預訂
         flight["seats_available"] -= 1
-        reservation_id = f"res_{len(self.reservations) + 1}"
+        reservation_id = f"res_{self._next_reservation_number}"
+        self._next_reservation_number += 1
         reservation = {
             "reservation_id": reservation_id,
             "user_id": user_id,
@@ -580,7 +642,7 @@ class TravelApi:
             "cabin": cabin,
             "baggage": baggage_count,
         }
-        self.reservations.append(reservation)
+        self._add_reservation(reservation)
 
         return f"預訂成功，預訂號：{reservation_id}，" f"總費用：{total_cost}元（包含行李費用）。"
 
@@ -607,27 +669,12 @@ class TravelApi:
             str: 修改結果信息。
         """
         # 獲取對應的預訂
-        reservation = next(
-            (
-                r
-                for r in self.reservations
-                if r["reservation_id"] == reservation_id
-                and r["user_id"] == user_id
-            ),
-            None,
-        )
+        reservation = self._find_user_reservation(reservation_id, user_id)
         if not reservation:
             return "預訂未找到或用戶ID不匹配。"
 
         # 檢查當前預訂的航班信息
-        current_flight = next(
-            (
-                f
-                for f in self.flights
-                if f["flight_no"] == reservation["flight_no"]
-            ),
-            None,
-        )
+        current_flight = self._find_flight(reservation["flight_no"])
         if not current_flight:
             return "航班信息未找到。"
 
@@ -646,10 +693,7 @@ class TravelApi:
 
         if new_flight_no and new_flight_no != reservation["flight_no"]:
             # 更新航班号（若提供）但必须匹配出发地和目的地
-            new_flight = next(
-                (f for f in self.flights if f["flight_no"] == new_flight_no),
-                None,
-            )
+            new_flight = self._find_flight(new_flight_no)
             if (
                 new_flight
                 and new_flight["origin"] == current_flight["origin"]
@@ -661,13 +705,14 @@ class TravelApi:
                 return "航班更改失敗：新的航班號無效或目的地不匹配。"
 
         # 更新艙位（若提供）並計算價格差價
-        if new_cabin and new_cabin != reservation.get("cabin"):
+        cabin = reservation["cabin"]
+        if new_cabin and new_cabin != cabin:
             price_difference = self.calculate_price_difference(
                 current_flight,
-                reservation["cabin"],
+                cabin,
                 new_cabin,
             )
-            reservation["cabin"] = new_cabin
+            reservation["cabin"] = cabin = new_cabin
             if price_difference > 0:
                 # 扣除差價
                 if self.update_balance(
@@ -690,12 +735,14 @@ class TravelApi:
             membership = user["membership_level"]
             max_free_baggage = self.get_baggage_allowance(
                 membership,
-                reservation["cabin"],
+                cabin,
             )
             current_baggage = reservation.get("baggage", 0)
             total_baggage = current_baggage + add_baggage
-            extra_baggage = max(0, total_baggage - max_free_baggage)
-            baggage_cost = extra_baggage * 50
+            baggage_cost = self._extra_baggage_fee(
+                max_free_baggage,
+                total_baggage,
+            )
             if baggage_cost > 0:
                 # 扣除行李費用
                 if self.update_balance(user, payment_method, -baggage_cost):
@@ -735,35 +782,17 @@ class TravelApi:
         if not user:
             return "用戶ID無效。"
 
-        reservation = next(
-            (
-                r
-                for r in self.reservations
-                if r["reservation_id"] == reservation_id
-                and r["user_id"] == user_id
-            ),
-            None,
-        )
+        reservation = self._find_user_reservation(reservation_id, user_id)
         if not reservation:
             return "預訂ID無效或與該用戶無關。"
 
         # 檢查航班信息是否存在
-        flight = next(
-            (
-                f
-                for f in self.flights
-                if f["flight_no"] == reservation["flight_no"]
-            ),
-            None,
-        )
+        flight = self._find_flight(reservation["flight_no"])
         if not flight:
             return "航班信息無效。"
 
         # 檢查航班是否已起飛
-        depart_time = datetime.strptime(
-            flight["depart_time"],
-            "%Y-%m-%d %H:%M:%S",
-        )
+        depart_time = self._flight_times[id(flight)][0]
         if current_time > depart_time:
             return "航段已使用，無法取消。"
 
@@ -825,10 +854,8 @@ class TravelApi:
         Returns:
             float: 價格差異（正數表示需支付差價，負數表示退款）。
         """
-        cabin_prices = {
-            "經濟艙": flight["economy_price"],
-            "商務艙": flight["business_price"],
-        }
-        old_price = cabin_prices.get(old_cabin, 0)
-        new_price = cabin_prices.get(new_cabin, 0)
+        old_price_key = _CABIN_PRICE_KEYS.get(old_cabin)
+        new_price_key = _CABIN_PRICE_KEYS.get(new_cabin)
+        old_price = flight[old_price_key] if old_price_key else 0
+        new_price = flight[new_price_key] if new_price_key else 0
         return new_price - old_price
@@ -56,6 +56,21 @@ class ACEPhone:
         self._food_platform_app = FoodPlatformApi(self._state)
         self._travel = TravelApi()
 
+        # Map each tool function name to the object providing it, so that
+        # dispatching is a single dict lookup. The first app wins on clashes.
+        self._tool_owners: dict[str, Any] = {
+            "turn_on_wifi": self,
+            "login_device": self,
+        }
+        for app in (
+            self._message_app,
+            self._food_platform_app,
+            self._reminder_app,
+            self._travel,
+        ):
+            for name in app.tool_functions:
+                self._tool_owners.setdefault(name, app)
+
     def turn_on_wifi(self) -> dict[str, bool | str]:
         """開啟WiFi連接。"""
         self._state["wifi"] = True
@@ -99,24 +114,10 @@ class ACEPhone:
     @_tool_function_wrapper
     def get_tool_function(self, name: str) -> Callable:
         """Get a tool function by name."""
-        if name in [
-            "turn_on_wifi",
-            "login_device",
-        ]:
-            return getattr(self, name)
-
-        if name in self._message_app.tool_functions:
-            return getattr(self._message_app, name)
-
-        if name in self._food_platform_app.tool_functions:
-            return getattr(self._food_platform_app, name)
-
-        if name in self._reminder_app.tool_functions:
-            return getattr(self._reminder_app, name)
-
-        if name in self._travel.tool_functions:
-            return getattr(self._travel, name)
+        owner = self._tool_owners.get(name)
+        if owner is None:
+            raise ValueError(
+                f"Tool function '{name}' not found in ACEPhone.",
+            )
 
-        raise ValueError(
-            f"Tool function '{name}' not found in ACEPhone.",
-        )
+        return getattr(owner, name)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Unittests for the ACEBench simulation tools."""
+from unittest import TestCase
+
+from agentscope.evaluate._ace_benchmark._ace_tools_api import (
+    FoodPlatformApi,
+    MessageApi,
+    TravelApi,
+)
+
+
+class ACEToolsTest(TestCase):
+    """Test cases for the ACEBench simulation tools."""
+
+    def test_device_state_failure_is_not_shared(self) -> None:
+        """Each rejected call returns its own failure response."""
+        message_api = MessageApi({"wifi": False, "logged_in": False})
+
+        first = message_api.view_messages_between_users("Eve", "Frank")
+        first["note"] = "annotated by the caller"
+        second = message_api.view_messages_between_users("Eve", "Frank")
+
+        self.assertEqual(first["status"], False)
+        self.assertNotIn("note", second)
+        self.assertIsNot(first, second)
+
+    def test_sent_message_is_latest(self) -> None:
+        """A message sent in the session is newer than the seeded ones."""
+        message_api = MessageApi({"wifi": True, "logged_in": True})
+        message_api.delete_message(6)
+        message_api.send_message("Eve", "Frank", "See you at 4 PM.")
+
+        latest = message_api.get_latest_message_id()
+        self.assertEqual(latest["status"], True)
+        self.assertEqual(latest["message_id"], 7)
+        self.assertEqual(
+            message_api.get_earliest_message_id()["message_id"],
+            3,
+        )
+        self.assertIsNone(message_api.get_all_message_times_with_ids()[7])
+
+    def test_message_ids_without_timed_messages(self) -> None:
+        """The latest and earliest IDs fall back to the sending order."""
+        message_api = MessageApi({"wifi": True, "logged_in": True})
+        for message_id in range(1, 5):
+            message_api.delete_message(message_id)
+        message_api.send_message("Eve", "Frank", "First")
+        message_api.send_message("Frank", "Eve", "Second")
+        message_api.delete_message(5)
+        message_api.delete_message(6)
+
+        self.assertEqual(
+            message_api.get_all_message_times_with_ids(),
+            {7: None, 8: None},
+        )
+        self.assertEqual(message_api.get_latest_message_id()["message_id"], 8)
+        self.assertEqual(
+            message_api.get_earliest_message_id()["message_id"],
+            7,
+        )
+
+        message_api.delete_message(7)
+        message_api.delete_message(8)
+        self.assertEqual(
+            message_api.get_latest_message_id(),
+            {"status": False, "message": "短信記錄為空"},
+        )
+
+    def test_message_state_dict_is_a_copy(self) -> None:
+        """Changing the exported inbox does not change the app state."""
+        message_api = MessageApi({"wifi": True, "logged_in": True})
+        state = message_api.get_state_dict()
+        del state["MessageApi"]["inbox"]["1"]
+
+        self.assertIn("1", message_api.get_state_dict()["MessageApi"]["inbox"])
+
+    def test_search_orders_by_product(self) -> None:
+        """Orders are matched by the product names of their items."""
+        food_platform_api = FoodPlatformApi({"wifi": True, "logged_in": True})
+        food_platform_api.login_food_platform("Eve", "password123")
+        food_platform_api.add_food_delivery_order(
+            "Eve",
+            "喜茶",
+            [{"product": "芝士奶茶", "quantity": 1}],
+        )
+
+        result = food_platform_api.search_orders("芝士")
+        self.assertEqual(result["status"], True)
+        self.assertEqual(len(result["orders"]), 1)
+        self.assertEqual(
+            food_platform_api.search_orders("披萨"),
+            {"status": False, "message": "沒有找到匹配的訂單"},
+        )
+
+    def test_reserve_flight_with_wrong_password(self) -> None:
+        """A wrong password fails the authentication without side effects."""
+        travel_api = TravelApi()
+        result = travel_api.reserve_flight(
+            "user1",
+            "wrong-password",
+            "CA1234",
+            "經濟艙",
+            "bank",
+            1,
+        )
+
+        self.assertEqual(result, "認證失敗，請檢查用戶ID和密碼。")
+        self.assertEqual(travel_api.users["user1"]["bank_balance"], 50000.0)
+        self.assertEqual(len(travel_api.reservations), 4)